@@ -0,0 +1,145 @@
+import heapq
+import threading
+import time
+
+from config import ERROR_WINDOW
+from dedup import error_signature
+
+SUMMARY_HEADER = 'Ошибки в работе программы за {minutes} мин:'
+SUMMARY_LINE = '{signature} — {count} раз, с {first} по {last}'
+SINGLE_MESSAGE = 'Ошибка в работе программы: {error}'
+
+
+def _format_time(timestamp):
+    return time.strftime('%H:%M:%S', time.localtime(timestamp))
+
+
+class _Group:
+    __slots__ = ('error', 'count', 'first', 'last')
+
+    def __init__(self, error, now):
+        self.error = error
+        self.count = 0
+        self.first = now
+        self.last = now
+
+
+class _Window:
+    __slots__ = ('deadline', 'groups')
+
+    def __init__(self, deadline):
+        self.deadline = deadline
+        self.groups = {}
+
+
+class ErrorAggregator:
+    """Сводим ошибки чата в два сообщения за окно.
+
+    Ошибки группируются по классу и сообщению без чисел и лишних
+    пробелов (error_signature). Первая ошибка сразу уходит в чат и
+    открывает окно на window секунд; ошибки, случившиеся после нее,
+    попадают в сводку, которая уходит по окончании окна, с числом ошибок
+    каждой группы и временем первой и последней. Поэтому в чат попадает
+    не больше двух сообщений об ошибках за окно, как бы ни чередовались
+    сбои и успешные запросы. Окна всех чатов закрывает один поток по
+    куче сроков.
+    """
+
+    def __init__(self, report, window=ERROR_WINDOW, clock=time.time):
+        self.window = window
+        self._report = report
+        self._clock = clock
+        self._windows = {}
+        self._deadlines = []
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._thread = None
+
+    def start(self):
+        """Запускаем поток, отправляющий сводки по истечении окна."""
+        self._thread = threading.Thread(
+            target=self._run, name='errors', daemon=True
+        )
+        self._thread.start()
+
+    def add(self, chat_id, error):
+        """Отправляем первую ошибку окна, а остальные учитываем в сводке."""
+        now = self._clock()
+        signature = error_signature(error)
+        with self._condition:
+            window = self._windows.get(chat_id)
+            if window is None:
+                window = self._windows[chat_id] = _Window(now + self.window)
+                heapq.heappush(self._deadlines, (window.deadline, chat_id))
+                self._condition.notify()
+                first = True
+            else:
+                first = False
+                group = window.groups.get(signature)
+                if group is None:
+                    group = window.groups[signature] = _Group(error, now)
+                group.count += 1
+                group.last = now
+        if first:
+            self._report(chat_id, SINGLE_MESSAGE.format(error=error))
+
+    def render(self, groups):
+        """Собираем текст сводки по группам ошибок окна."""
+        lines = [SUMMARY_HEADER.format(
+            minutes=max(round(self.window / 60), 1)
+        )]
+        for signature, group in sorted(
+            groups.items(), key=lambda item: item[1].first
+        ):
+            lines.append(SUMMARY_LINE.format(
+                signature=signature, count=group.count,
+                first=_format_time(group.first),
+                last=_format_time(group.last)
+            ))
+        return '\n'.join(lines)
+
+    def flush(self, chat_id):
+        """Закрываем окно чата и отправляем сводку, если были повторы."""
+        with self._condition:
+            window = self._windows.pop(chat_id, None)
+        if window is not None and window.groups:
+            self._report(chat_id, self.render(window.groups))
+
+    def stop(self, timeout=None):
+        """Останавливаем поток и отправляем сводки по всем открытым окнам."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        with self._condition:
+            chats = list(self._windows)
+            self._deadlines = []
+        for chat_id in chats:
+            self.flush(chat_id)
+
+    def _due(self, now):
+        due = []
+        while self._deadlines and self._deadlines[0][0] <= now:
+            deadline, chat_id = heapq.heappop(self._deadlines)
+            window = self._windows.get(chat_id)
+            if window is not None and window.deadline == deadline:
+                due.append(chat_id)
+        return due
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if self._stopped:
+                    return
+                due = self._due(self._clock())
+                if not due:
+                    timeout = (
+                        self._deadlines[0][0] - self._clock()
+                        if self._deadlines else None
+                    )
+                    self._condition.wait(timeout)
+                    continue
+            for chat_id in due:
+                self.flush(chat_id)
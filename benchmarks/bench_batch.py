@@ -0,0 +1,33 @@
+"""Стоимость пакетной обработки ответа с тысячами работ.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_batch
+"""
+import logging
+import time
+
+from bot import check_response, pending_updates
+from journal import Journal
+
+from benchmarks.payloads import make_response
+
+SIZES = (1000, 5000, 20000)
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    print(f'{"homeworks":>10}{"total, ms":>12}{"per item, us":>15}')
+    for size in SIZES:
+        response = make_response(size)
+        started = time.perf_counter()
+        check_response(response)
+        messages = pending_updates(
+            response['homeworks'], Journal(), 'bench'
+        )
+        elapsed = time.perf_counter() - started
+        assert len(messages) == size
+        print(f'{size:>10}{elapsed * 1e3:>12.2f}{elapsed / size * 1e6:>15.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Память и скорость структур, отсеивающих повторы, на 100 тысячах ключей.
+
+Повторные уведомления отсеивают таблица статусов StateCache
+(ограничена maxsize), журнал доставленных статусов Journal и
+PendingDeliveries с сообщениями, ждущими отправки.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_dedup
+"""
+import time
+import tracemalloc
+from concurrent.futures import Future
+
+from delivery import PendingDeliveries
+from journal import Journal
+from models import Homework
+from state import StateCache
+
+KEYS = 100_000
+
+
+def records(start, stop):
+    return [
+        (f'tenant-{i % 1000}',
+         Homework(str(i), f'hw-{i}.zip', 'approved', '2024-01-01T00:00:00Z'))
+        for i in range(start, stop)
+    ]
+
+
+def fill_state(cache, batch):
+    for tenant_id, record in batch:
+        cache.apply(tenant_id, record)
+
+
+def fill_journal(journal, batch):
+    for tenant_id, record in batch:
+        journal.record_status(
+            tenant_id, record.homework_id, record.status, record.name
+        )
+
+
+def fill_pending(pending, batch):
+    for tenant_id, record in batch:
+        pending.submit((tenant_id, record.homework_id), Future)
+
+
+def measure(name, make, fill, size):
+    """Печатаем память и время заполнения структуры KEYS ключами."""
+    batch = records(0, KEYS)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    structure = make()
+    fill(structure, batch)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    memory = sum(
+        stat.size_diff for stat in after.compare_to(before, 'filename')
+    )
+    structure = make()
+    started = time.perf_counter()
+    fill(structure, batch)
+    insert = time.perf_counter() - started
+    evicted = records(KEYS, 2 * KEYS)
+    started = time.perf_counter()
+    fill(structure, evicted)
+    grow = time.perf_counter() - started
+    print(f'{name}: {memory / 2 ** 20:.1f} MiB, {memory / KEYS:.0f} B/key, '
+          f'insert {insert / KEYS * 1e9:.0f} ns/op, '
+          f'next {KEYS} keys {grow / KEYS * 1e9:.0f} ns/op, '
+          f'size after {2 * KEYS} keys: {size(structure)}')
+
+
+def main():
+    print(f'keys={KEYS}')
+    measure(
+        'StateCache', lambda: StateCache(maxsize=KEYS), fill_state, len
+    )
+    measure(
+        'Journal', Journal, fill_journal,
+        lambda journal: len(journal.statuses)
+    )
+    measure('PendingDeliveries', PendingDeliveries, fill_pending, len)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""Сравнение движка с N отдельными процессами по памяти и CPU.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_engine --tenants 100 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FAKE_LATENCY = 0.05
+
+
+class FakeBot:
+    """Бот-заглушка, который ничего не отправляет."""
+
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        pass
+
+
+def fake_fetch(headers, timestamp, deadline=None):
+    """Имитируем ответ API с задержкой сети."""
+    time.sleep(FAKE_LATENCY)
+    return {
+        'homeworks': [{'homework_name': 'hw', 'status': 'reviewing'}],
+        'current_date': int(time.time()),
+    }
+
+
+def run_worker(tenants, duration, period):
+    """Опрашиваем tenants арендаторов в текущем процессе."""
+    from engine import PollingEngine
+    from tenants import Tenant, TenantRegistry
+
+    registry = TenantRegistry(
+        Tenant(i, f'token-{i}', i) for i in range(tenants)
+    )
+    engine = PollingEngine(
+        registry, FakeBot(), period=period, fetch=fake_fetch
+    )
+    asyncio.run(engine.run(duration=duration))
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    print(json.dumps({
+        'cpu': usage.ru_utime + usage.ru_stime,
+        'maxrss_kb': usage.ru_maxrss,
+    }))
+
+
+def spawn(tenants, duration, period):
+    return subprocess.Popen(
+        [
+            sys.executable, '-m', 'benchmarks.bench_engine', '--worker',
+            '--tenants', str(tenants), '--duration', str(duration),
+            '--period', str(period),
+        ],
+        cwd=ROOT_DIR,
+        stdout=subprocess.PIPE,
+        env=dict(os.environ, TELEGRAM_TOKEN='bench', PRACTICUM_TOKEN='bench',
+                 TELEGRAM_CHAT_ID='0'),
+    )
+
+
+def collect(processes):
+    cpu = rss = 0
+    for process in processes:
+        out, _ = process.communicate()
+        stats = json.loads(out.decode().strip().splitlines()[-1])
+        cpu += stats['cpu']
+        rss += stats['maxrss_kb']
+    return cpu, rss
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tenants', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=5)
+    parser.add_argument('--period', type=float, default=0.5)
+    parser.add_argument('--worker', action='store_true')
+    args = parser.parse_args()
+    if args.worker:
+        run_worker(args.tenants, args.duration, args.period)
+        return
+
+    started = time.perf_counter()
+    engine_cpu, engine_rss = collect(
+        [spawn(args.tenants, args.duration, args.period)]
+    )
+    engine_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    procs_cpu, procs_rss = collect(
+        [spawn(1, args.duration, args.period) for _ in range(args.tenants)]
+    )
+    procs_time = time.perf_counter() - started
+
+    print(f'tenants={args.tenants} duration={args.duration}s')
+    print(f'{"mode":<12}{"cpu, s":>10}{"rss, MiB":>12}{"wall, s":>10}')
+    for mode, cpu, rss, wall in (
+        ('engine', engine_cpu, engine_rss, engine_time),
+        ('processes', procs_cpu, procs_rss, procs_time),
+    ):
+        print(f'{mode:<12}{cpu:>10.2f}{rss / 1024:>12.1f}{wall:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
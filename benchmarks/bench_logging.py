@@ -0,0 +1,90 @@
+"""Задержка вызова логирования в цикле опроса.
+
+Сравнивает синхронную запись в файл, как было с basicConfig, с
+очередью и фоновым потоком из logs.py; отдельно — стоимость
+отключенного debug с f-строкой и с ленивыми аргументами.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_logging
+"""
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+from logs import TEXT_FORMAT, make_file_handler, make_log_pipeline
+
+CALLS = 20_000
+
+
+class Status:
+    """Объект с дорогим __str__, как исключения и работы в логах."""
+
+    def __str__(self):
+        return ','.join(str(i) for i in range(50))
+
+
+def measure(logger, calls=CALLS):
+    status = Status()
+    samples = []
+    for i in range(calls):
+        started = time.perf_counter_ns()
+        logger.info('Статус работы %s обновлен: %s', i, status)
+        samples.append(time.perf_counter_ns() - started)
+    samples.sort()
+    return (statistics.mean(samples), samples[len(samples) // 2],
+            samples[int(len(samples) * 0.99)])
+
+
+def report(name, stats):
+    mean, p50, p99 = stats
+    print(f'{name:<22}mean={mean:>7.0f} ns  p50={p50:>7.0f} ns  '
+          f'p99={p99:>7.0f} ns')
+
+
+def disabled(logger, lazy):
+    status = Status()
+    started = time.perf_counter()
+    for i in range(CALLS):
+        if lazy:
+            logger.debug('Статус работы %s обновлен: %s', i, status)
+        else:
+            logger.debug(f'Статус работы {i} обновлен: {status}')
+    return (time.perf_counter() - started) / CALLS * 1e9
+
+
+def main():
+    workdir = tempfile.mkdtemp(prefix='homework-bot-logs-')
+    logger = logging.getLogger('bench')
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+
+    handler = logging.FileHandler(
+        os.path.join(workdir, 'sync.log'), encoding='UTF-8'
+    )
+    handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    logger.handlers = [handler]
+    report('sync file', measure(logger))
+    handler.close()
+
+    for log_format in ('text', 'json'):
+        queue_handler, listener = make_log_pipeline(make_file_handler(
+            os.path.join(workdir, f'{log_format}.log'), log_format
+        ))
+        logger.handlers = [queue_handler]
+        listener.start()
+        stats = measure(logger)
+        started = time.perf_counter()
+        listener.stop()
+        report(f'queue + {log_format}', stats)
+        print(f'{"":<22}drain after loop: '
+              f'{(time.perf_counter() - started) * 1e3:.0f} ms')
+
+    print(f'disabled debug, f-string: {disabled(logger, False):.0f} ns/op')
+    print(f'disabled debug, lazy:     {disabled(logger, True):.0f} ns/op')
+    print(f'workdir: {workdir}')
+
+
+if __name__ == '__main__':
+    main()
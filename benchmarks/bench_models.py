@@ -0,0 +1,73 @@
+"""Память на хранение последних состояний работ и стоимость сообщений.
+
+Сравниваем словари из JSON-ответов с записями Homework.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_models
+"""
+import json
+import time
+import tracemalloc
+
+from config import HOMEWORK_VERDICTS
+from models import Homework, render_status
+
+HOMEWORKS = 50_000
+STATUSES = list(HOMEWORK_VERDICTS)
+
+
+def raw_homeworks():
+    """Имитируем работы, пришедшие в разных ответах API."""
+    for i in range(HOMEWORKS):
+        yield json.loads(json.dumps({
+            'id': i,
+            'homework_name': f'student{i % 5000}__sprint{i % 12}.zip',
+            'status': STATUSES[i % 3],
+            'date_updated': '2023-01-01T00:00:00Z',
+            'reviewer_comment': '',
+            'lesson_name': f'Спринт {i % 12}',
+        }))
+
+
+def legacy_render(name, status):
+    """Прежний способ: f-строка и поиск вердикта на каждый вызов."""
+    verdict = HOMEWORK_VERDICTS.get(status)
+    return f'Изменился статус проверки работы "{name}". {verdict}'
+
+
+def measure(build):
+    tracemalloc.start()
+    state = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(state) == HOMEWORKS
+    return size
+
+
+def main():
+    dict_size = measure(lambda: {
+        homework['id']: homework for homework in raw_homeworks()
+    })
+    record_size = measure(lambda: {
+        homework['id']: Homework.from_dict(homework)
+        for homework in raw_homeworks()
+    })
+    print(f'homeworks={HOMEWORKS}')
+    print(f'dicts:   {dict_size / 2 ** 20:6.1f} MiB')
+    print(f'records: {record_size / 2 ** 20:6.1f} MiB')
+
+    records = [Homework.from_dict(homework) for homework in raw_homeworks()]
+    started = time.perf_counter()
+    for record in records:
+        legacy_render(record.name, record.status)
+    fstring = time.perf_counter() - started
+    started = time.perf_counter()
+    for record in records:
+        render_status(record.name, record.status)
+    template = time.perf_counter() - started
+    print(f'f-string message: {fstring / HOMEWORKS * 1e9:.0f} ns/op')
+    print(f'template message: {template / HOMEWORKS * 1e9:.0f} ns/op')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Сравнение фиксированной паузы и адаптивного планировщика.
+
+Моделируем месяц работы студента: работа уходит на проверку, через
+некоторое время получает вердикт, между работами бывают долгие простои.
+Считаем число запросов к API и задержку обнаружения вердиктов.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_scheduler
+"""
+import random
+import statistics
+
+from config import RETRY_PERIOD
+from scheduler import AdaptiveScheduler
+
+HOUR = 3600
+DAY = 24 * HOUR
+DURATION = 30 * DAY
+
+
+def make_events(rng):
+    """Собираем список (время, id работы, статус) по возрастанию времени."""
+    events = []
+    now = rng.uniform(0, DAY)
+    homework_id = 0
+    while now < DURATION:
+        homework_id += 1
+        now += rng.uniform(0, HOUR)
+        events.append((now, homework_id, 'reviewing'))
+        now += rng.uniform(10 * 60, 3 * HOUR)
+        events.append((now, homework_id, rng.choice(('approved', 'rejected'))))
+        now += rng.expovariate(1 / (2 * DAY))
+    return events
+
+
+class FixedScheduler:
+    def observe(self, homeworks):
+        pass
+
+    def next_delay(self):
+        return RETRY_PERIOD
+
+
+def simulate(events, make_scheduler):
+    clock = [0.0]
+    scheduler = make_scheduler(lambda: clock[0])
+    requests = 0
+    latencies = []
+    position = 0
+    while clock[0] < DURATION:
+        requests += 1
+        homeworks = []
+        while position < len(events) and events[position][0] <= clock[0]:
+            changed_at, homework_id, status = events[position]
+            homeworks.append({'id': homework_id, 'status': status})
+            if status != 'reviewing':
+                latencies.append(clock[0] - changed_at)
+            position += 1
+        scheduler.observe(homeworks)
+        clock[0] += scheduler.next_delay()
+    return requests, latencies
+
+
+def main():
+    rng = random.Random(42)
+    events = make_events(rng)
+    modes = (
+        ('fixed', lambda clock: FixedScheduler()),
+        ('adaptive', lambda clock: AdaptiveScheduler(
+            clock=clock, rng=random.Random(1)
+        )),
+    )
+    print(f'{"mode":<10}{"requests":>10}{"p50, s":>10}{"p95, s":>10}')
+    for mode, make_scheduler in modes:
+        requests, latencies = simulate(events, make_scheduler)
+        p50 = statistics.median(latencies)
+        p95 = statistics.quantiles(latencies, n=20)[-1]
+        print(f'{mode:<10}{requests:>10}{p50:>10.0f}{p95:>10.0f}')
+
+
+if __name__ == '__main__':
+    main()
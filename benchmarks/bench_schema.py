@@ -0,0 +1,56 @@
+"""Стоимость проверки работ скомпилированной схемой.
+
+Для сравнения приведена прежняя ручная цепочка проверок из
+parse_status (без логирования).
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_schema
+"""
+import time
+
+from config import HOMEWORK_VERDICTS
+from schema import HOMEWORK_SCHEMA, compile_schema
+
+SIZES = (1000, 10000, 100000)
+
+validate_homeworks = compile_schema(
+    {'type': list, 'items': HOMEWORK_SCHEMA}, 'response.homeworks'
+)
+
+
+def legacy_validate(homeworks):
+    for homework in homeworks:
+        if 'homework_name' not in homework:
+            raise KeyError('Значение ключа homework_name не найдено')
+        if 'status' not in homework:
+            raise KeyError('Ключ status не найден')
+        if homework['status'] not in HOMEWORK_VERDICTS:
+            raise ValueError(
+                f'Неизвестный статус домашней работы: {homework["status"]}'
+            )
+
+
+def measure(func, homeworks, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(homeworks)
+        best = min(best, time.perf_counter() - started)
+    return best / len(homeworks) * 1e9
+
+
+def main():
+    statuses = list(HOMEWORK_VERDICTS)
+    print(f'{"homeworks":>10}{"schema, ns":>12}{"legacy, ns":>12}')
+    for size in SIZES:
+        homeworks = [
+            {'id': i, 'homework_name': f'hw{i}', 'status': statuses[i % 3]}
+            for i in range(size)
+        ]
+        schema_ns = measure(validate_homeworks, homeworks)
+        legacy_ns = measure(legacy_validate, homeworks)
+        print(f'{size:>10}{schema_ns:>12.0f}{legacy_ns:>12.0f}')
+
+
+if __name__ == '__main__':
+    main()
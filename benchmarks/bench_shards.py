@@ -0,0 +1,79 @@
+"""Масштабирование опроса по процессам-шардам.
+
+Запускает ShardSupervisor с разным числом шардов против локальных
+заменителей API и считает обработанные ответы в секунду. Ответы
+большие (--homeworks работ), поэтому время уходит на разбор JSON и
+проверку — ту часть, что упирается в GIL одного процесса. Рост близок
+к линейному, пока шардов не больше свободных ядер; сам заменитель API
+работает в процессе бенчмарка и тоже занимает ядро.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_shards --workers 1 2 4 --tenants 200
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from shards import ShardSupervisor
+from tenants import Tenant, TenantRegistry
+
+from benchmarks.fake_servers import (
+    FakePracticumServer,
+    FakeTelegramServer,
+    serve,
+)
+
+
+def run(workers, args, practicum):
+    registry = TenantRegistry(
+        Tenant(f'tenant-{i}', 'bench', 10 ** 6 + i)
+        for i in range(args.tenants)
+    )
+    supervisor = ShardSupervisor(
+        registry, workers=workers, period=args.period,
+        journal_file=os.path.join(tempfile.mkdtemp(), 'journal.jsonl')
+    )
+    supervisor.start()
+    time.sleep(args.warmup)
+    before = practicum.counters['requests']
+    time.sleep(args.duration)
+    handled = practicum.counters['requests'] - before
+    supervisor.stop(timeout=10)
+    return handled / args.duration
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, nargs='+', default=(1, 2, 4))
+    parser.add_argument('--tenants', type=int, default=200)
+    parser.add_argument('--homeworks', type=int, default=500)
+    parser.add_argument('--period', type=float, default=0.01)
+    parser.add_argument('--warmup', type=float, default=5)
+    parser.add_argument('--duration', type=float, default=10)
+    args = parser.parse_args()
+
+    practicum = serve(FakePracticumServer(
+        changes_per_second=0.1, extra_homeworks=args.homeworks
+    ))
+    telegram_server = serve(FakeTelegramServer())
+    os.environ['PRACTICUM_ENDPOINT'] = practicum.url
+    os.environ['TELEGRAM_BASE_URL'] = telegram_server.base_url
+    os.environ.setdefault('TELEGRAM_TOKEN', '1234:bench')
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    os.environ.setdefault(
+        'LOG_FILE', os.path.join(tempfile.mkdtemp(), 'bench.log')
+    )
+
+    print(f'cpus={os.cpu_count()} tenants={args.tenants} '
+          f'homeworks/response={args.homeworks}')
+    single = None
+    for workers in args.workers:
+        rate = run(workers, args, practicum)
+        single = single or rate
+        print(f'workers={workers:<3}{rate:>10.1f} responses/s'
+              f'   x{rate / single:.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,257 @@
+"""Локальные заменители API Практикума и Bot API телеграма.
+
+Оба сервера работают по настоящему HTTP на 127.0.0.1 и умеют
+добавлять задержку, ошибки 5xx, ответы 429 и большие ответы.
+"""
+import json
+import random
+import re
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from config import HOMEWORK_VERDICTS
+
+HOMEWORKS_PATH = '/api/user_api/homework_statuses/'
+EVENT_NAME = re.compile(r'event(\d+)')
+
+
+class FaultConfig:
+    """Параметры задержек и ошибок сервера."""
+
+    def __init__(self, latency=0.0, error_rate=0.0, throttle_rate=0.0,
+                 retry_after=1, seed=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, data, headers=()):
+        body = json.dumps(data, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def inject_faults(self, throttled):
+        """Добавляем задержку; возвращаем True, если ответ уже отправлен."""
+        faults = self.server.faults
+        if faults.latency:
+            time.sleep(faults.latency)
+        roll = faults.rng.random()
+        if roll < faults.error_rate:
+            self.send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {})
+            return True
+        if roll < faults.error_rate + faults.throttle_rate:
+            throttled(faults.retry_after)
+            return True
+        return False
+
+
+class _PracticumHandler(_Handler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != HOMEWORKS_PATH:
+            self.send_json(HTTPStatus.NOT_FOUND, {})
+            return
+        self.server.count('requests')
+        if self.inject_faults(self.throttled):
+            return
+        if not self.headers.get('Authorization', '').startswith('OAuth '):
+            self.send_json(HTTPStatus.UNAUTHORIZED, {
+                'code': 'not_authenticated',
+                'message': 'Учетные данные не были предоставлены.',
+            })
+            return
+        from_date = int(parse_qs(url.query).get('from_date', ['0'])[0])
+        self.send_json(HTTPStatus.OK, self.server.response(from_date))
+
+    def throttled(self, retry_after):
+        self.server.count('throttled')
+        self.send_json(
+            HTTPStatus.TOO_MANY_REQUESTS, {},
+            headers=[('Retry-After', str(retry_after))]
+        )
+
+
+class FakePracticumServer(ThreadingHTTPServer):
+    """Заменитель эндпоинта homework_statuses.
+
+    Со скоростью changes_per_second меняет статусы работ; в ответ
+    попадают изменения с from_date, а также extra_homeworks давно
+    проверенных работ для имитации больших ответов.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, changes_per_second=1.0, extra_homeworks=0,
+                 faults=None):
+        super().__init__(('127.0.0.1', 0), _PracticumHandler)
+        self.faults = faults or FaultConfig()
+        self.changes_per_second = changes_per_second
+        self.events = []
+        self.counters = {'requests': 0, 'throttled': 0}
+        self._lock = threading.Lock()
+        self._started = time.time()
+        statuses = list(HOMEWORK_VERDICTS)
+        self._extra = [
+            {
+                'id': 10 ** 9 + i,
+                'homework_name': f'old{i}.zip',
+                'status': statuses[i % len(statuses)],
+                'date_updated': '2020-01-01T00:00:00Z',
+                'reviewer_comment': 'x' * 200,
+            }
+            for i in range(extra_homeworks)
+        ]
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_port}{HOMEWORKS_PATH}'
+
+    def count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def _generate(self, now):
+        due = int((now - self._started) * self.changes_per_second)
+        statuses = list(HOMEWORK_VERDICTS)
+        while len(self.events) < due:
+            index = len(self.events)
+            created = self._started + index / self.changes_per_second
+            self.events.append((created, {
+                'id': index,
+                'homework_name': f'event{index}.zip',
+                'status': statuses[index % len(statuses)],
+                'date_updated': time.strftime(
+                    '%Y-%m-%dT%H:%M:%SZ', time.gmtime(created)
+                ),
+            }))
+
+    def response(self, from_date):
+        now = time.time()
+        with self._lock:
+            self._generate(now)
+            homeworks = [
+                homework for created, homework in self.events
+                if created >= from_date
+            ]
+        return {
+            'homeworks': homeworks + self._extra,
+            'current_date': int(now),
+        }
+
+    def created_at(self, text):
+        """Возвращаем время изменения, о котором сообщает text."""
+        match = EVENT_NAME.search(text)
+        if match is None:
+            return None
+        return self.events[int(match.group(1))][0]
+
+
+class _TelegramHandler(_Handler):
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        method = self.path.rsplit('/', 1)[-1]
+        if self.inject_faults(self.throttled):
+            return
+        if method == 'getUpdates':
+            self.send_json(HTTPStatus.OK, {
+                'ok': True, 'result': self.server.updates(payload)
+            })
+            return
+        if method != 'sendMessage':
+            self.send_json(HTTPStatus.NOT_FOUND, {
+                'ok': False, 'error_code': 404, 'description': 'Not Found'
+            })
+            return
+        self.server.record(payload)
+        self.send_json(HTTPStatus.OK, {'ok': True, 'result': {
+            'message_id': len(self.server.messages),
+            'date': int(time.time()),
+            'chat': {'id': int(payload['chat_id']), 'type': 'private'},
+            'text': payload['text'],
+        }})
+
+    def throttled(self, retry_after):
+        self.server.count_throttled()
+        self.send_json(HTTPStatus.TOO_MANY_REQUESTS, {
+            'ok': False,
+            'error_code': 429,
+            'description': f'Too Many Requests: retry after {retry_after}',
+            'parameters': {'retry_after': retry_after},
+        })
+
+
+class FakeTelegramServer(ThreadingHTTPServer):
+    """Заменитель методов sendMessage и getUpdates Bot API."""
+
+    daemon_threads = True
+
+    def __init__(self, faults=None):
+        super().__init__(('127.0.0.1', 0), _TelegramHandler)
+        self.faults = faults or FaultConfig()
+        self.messages = []
+        self.throttled = 0
+        self._updates = []
+        self._lock = threading.Lock()
+        self._new_update = threading.Condition(self._lock)
+
+    @property
+    def base_url(self):
+        return f'http://127.0.0.1:{self.server_port}/bot'
+
+    def count_throttled(self):
+        with self._lock:
+            self.throttled += 1
+
+    def send_command(self, chat_id, text):
+        """Имитируем сообщение пользователя боту."""
+        with self._lock:
+            self._updates.append({
+                'update_id': len(self._updates) + 1,
+                'message': {
+                    'message_id': len(self._updates) + 1,
+                    'date': int(time.time()),
+                    'chat': {'id': int(chat_id), 'type': 'private'},
+                    'text': text,
+                },
+            })
+            self._new_update.notify_all()
+
+    def updates(self, payload):
+        """Отдаем обновления после offset, ожидая их до timeout секунд."""
+        offset = int(payload.get('offset') or 0)
+        with self._lock:
+            self._new_update.wait_for(
+                lambda: len(self._updates) >= max(offset, 1),
+                timeout=min(float(payload.get('timeout') or 0), 1.0)
+            )
+            return self._updates[max(offset - 1, 0):]
+
+    def record(self, payload):
+        with self._lock:
+            self.messages.append(
+                (time.time(), payload['chat_id'], payload['text'])
+            )
+
+
+def serve(server):
+    """Запускаем сервер в фоновом потоке."""
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
@@ -0,0 +1,99 @@
+"""Сквозная нагрузка: настоящий main() против локальных серверов.
+
+Бот опрашивает FakePracticumServer через настоящий HTTP-клиент и
+отправляет сообщения в FakeTelegramServer через python-telegram-bot.
+Изменяются только адреса, журнал и интервал опроса; остальной код
+работает как в продакшене. Сеть не нужна.
+
+Запуск из корня репозитория:
+    python -m benchmarks.load --duration 30 --changes-per-second 0.5
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+from functools import partial
+
+os.environ.setdefault('PRACTICUM_TOKEN', 'load-test')
+os.environ.setdefault('TELEGRAM_TOKEN', '1234:load-test')
+os.environ.setdefault('TELEGRAM_CHAT_ID', '12345')
+
+import telegram  # noqa: E402
+
+import bot  # noqa: E402
+from scheduler import AdaptiveScheduler  # noqa: E402
+
+from benchmarks.fake_servers import (  # noqa: E402
+    FakePracticumServer,
+    FakeTelegramServer,
+    FaultConfig,
+    serve,
+)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--duration', type=float, default=30)
+    parser.add_argument('--period', type=float, default=1.0)
+    parser.add_argument('--changes-per-second', type=float, default=0.5)
+    parser.add_argument('--extra-homeworks', type=int, default=0)
+    parser.add_argument('--api-latency', type=float, default=0.02)
+    parser.add_argument('--api-error-rate', type=float, default=0.0)
+    parser.add_argument('--api-throttle-rate', type=float, default=0.0)
+    parser.add_argument('--tg-latency', type=float, default=0.02)
+    parser.add_argument('--tg-error-rate', type=float, default=0.0)
+    parser.add_argument('--tg-throttle-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    practicum = serve(FakePracticumServer(
+        changes_per_second=args.changes_per_second,
+        extra_homeworks=args.extra_homeworks,
+        faults=FaultConfig(args.api_latency, args.api_error_rate,
+                           args.api_throttle_rate),
+    ))
+    telegram_server = serve(FakeTelegramServer(
+        faults=FaultConfig(args.tg_latency, args.tg_error_rate,
+                           args.tg_throttle_rate, seed=1),
+    ))
+    workdir = tempfile.mkdtemp(prefix='homework-bot-load-')
+    bot.ENDPOINT = practicum.url
+    bot.JOURNAL_FILE = os.path.join(workdir, 'journal.jsonl')
+    bot.AdaptiveScheduler = partial(
+        AdaptiveScheduler, period=args.period, fast_period=args.period,
+        jitter=0
+    )
+    telegram.Bot = partial(telegram.Bot, base_url=telegram_server.base_url)
+
+    threading.Thread(target=bot.main, daemon=True).start()
+    time.sleep(args.duration)
+
+    latencies = []
+    for received, _, text in list(telegram_server.messages):
+        created = practicum.created_at(text)
+        if created is not None:
+            latencies.append(received - created)
+    generated = len(practicum.events)
+    print(f'duration: {args.duration:.0f} s, workdir: {workdir}')
+    print(f'API requests: {practicum.counters["requests"]}, '
+          f'429: {practicum.counters["throttled"]}')
+    print(f'telegram messages: {len(telegram_server.messages)}, '
+          f'429: {telegram_server.throttled}')
+    print(f'status changes: {generated}, delivered: {len(latencies)}, '
+          f'throughput: {len(latencies) / args.duration:.2f} msg/s')
+    if latencies:
+        print('latency, s: '
+              f'p50={statistics.median(latencies):.3f} '
+              f'p95={percentile(latencies, 0.95):.3f} '
+              f'p99={percentile(latencies, 0.99):.3f} '
+              f'max={max(latencies):.3f}')
+
+
+if __name__ == '__main__':
+    main()
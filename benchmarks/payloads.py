@@ -0,0 +1,67 @@
+"""Воспроизводимые синтетические ответы API для бенчмарков."""
+import copy
+import random
+import time
+
+from config import HOMEWORK_VERDICTS
+
+CURRENT_DATE = 1_700_000_000
+STATUSES = tuple(HOMEWORK_VERDICTS)
+
+
+def make_homework(index, rng):
+    """Собираем одну работу в формате API."""
+    return {
+        'id': index,
+        'status': rng.choice(STATUSES),
+        'homework_name': f'student{index % 997}__hw{index % 17:02d}.zip',
+        'reviewer_comment': 'Всё нравится' if rng.random() < 0.5 else '',
+        'date_updated': time.strftime(
+            '%Y-%m-%dT%H:%M:%SZ',
+            time.gmtime(1_600_000_000 + rng.randrange(10 ** 8))
+        ),
+        'lesson_name': f'Спринт {index % 17}',
+    }
+
+
+def make_response(size, seed=0):
+    """Собираем корректный ответ API с size работами."""
+    rng = random.Random(seed)
+    return {
+        'homeworks': [make_homework(i, rng) for i in range(size)],
+        'current_date': CURRENT_DATE,
+    }
+
+
+def malformed_responses(size, seed=0):
+    """Возвращаем ответы с ошибками структуры, как в tests/test_bot.py."""
+    valid = make_response(size, seed)
+    no_homeworks = {'current_date': CURRENT_DATE}
+    no_current_date = {'homeworks': valid['homeworks']}
+    current_date_not_int = dict(valid, current_date=str(CURRENT_DATE))
+    homeworks_not_list = dict(
+        valid, homeworks=valid['homeworks'][0] if size else {}
+    )
+    return {
+        'no_homework_key': no_homeworks,
+        'no_current_date_key': no_current_date,
+        'current_date_not_int': current_date_not_int,
+        'not_dict_response': [valid],
+        'homeworks_not_in_list': homeworks_not_list,
+    }
+
+
+def malformed_homeworks(seed=0):
+    """Возвращаем работы с ошибками, которые отвергает parse_status."""
+    rng = random.Random(seed)
+    base = make_homework(0, rng)
+    no_name = copy.copy(base)
+    del no_name['homework_name']
+    no_status = copy.copy(base)
+    del no_status['status']
+    return {
+        'no_homework_name': no_name,
+        'no_status': no_status,
+        'unknown_status': dict(base, status='unknown'),
+        'not_dict_homework': [base],
+    }
@@ -0,0 +1,184 @@
+"""Набор микробенчмарков функций цикла опроса с базовой линией.
+
+Для каждого случая выводится время на операцию и пиковый объем
+выделенной памяти на операцию. С --save медиана SAVE_ROUNDS прогонов
+сохраняется в baseline.json, с --compare результаты сравниваются с
+ней. Случаи, замедлившиеся больше порога, перемеряются до медианы того
+же числа прогонов, и если замедление подтвердилось, оно отмечается как
+регрессия, а скрипт завершается с кодом 1.
+
+Запуск из корня репозитория:
+    python -m benchmarks.run --compare
+    python -m benchmarks.run --sizes 1 1000 --save
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import timeit
+import tracemalloc
+
+from bot import check_response, parse_status, pending_updates
+from journal import Journal
+from models import Homework, render_status
+
+from benchmarks.payloads import (
+    make_response,
+    malformed_homeworks,
+    malformed_responses,
+)
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+SIZES = (1, 10, 100, 1000, 10000, 100000)
+REPEAT = 3
+SAVE_ROUNDS = 3
+
+
+def _expect_error(func, argument):
+    def run():
+        try:
+            func(argument)
+        except (KeyError, TypeError, ValueError):
+            return
+        raise AssertionError(f'{func.__name__} принял {argument!r:.80}')
+    return run
+
+
+def cases(size):
+    """Возвращаем (имя, число операций, функция) для размера size."""
+    response = make_response(size)
+    homeworks = response['homeworks']
+    records = [Homework.from_dict(homework) for homework in homeworks]
+    journal = Journal()
+
+    def parse_all():
+        for homework in homeworks:
+            parse_status(homework)
+
+    def render_all():
+        for record in records:
+            render_status(record.name, record.status)
+
+    yield 'check_response', 1, lambda: check_response(response)
+    if size:
+        yield 'parse_status', size, parse_all
+        yield 'render_status', size, render_all
+        yield 'pending_updates', size, lambda: pending_updates(
+            homeworks, journal, 'bench'
+        )
+    for name, data in malformed_responses(size).items():
+        yield f'check_response[{name}]', 1, _expect_error(
+            check_response, data
+        )
+    if size == 1:
+        for name, data in malformed_homeworks().items():
+            yield f'parse_status[{name}]', 1, _expect_error(
+                parse_status, data
+            )
+
+
+def measure(func, ops):
+    timer = timeit.Timer(func)
+    loops, _ = timer.autorange()
+    best = min(timer.repeat(REPEAT, loops)) / loops
+    tracemalloc.start()
+    func()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    func()
+    peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return {
+        'ns_per_op': round(best / ops * 1e9, 1),
+        'bytes_per_op': round(peak / ops, 1),
+    }
+
+
+def run(sizes):
+    results = {}
+    for size in sizes:
+        for name, ops, func in cases(size):
+            key = f'{name}/{size}'
+            results[key] = measure(func, ops)
+            stats = results[key]
+            print(f'{key:<50}{stats["ns_per_op"]:>12.0f} ns/op'
+                  f'{stats["bytes_per_op"]:>12.0f} B/op')
+    return results
+
+
+def _median(samples):
+    return sorted(samples, key=lambda stats: stats['ns_per_op'])[
+        len(samples) // 2
+    ]
+
+
+def settle(sizes, rounds=SAVE_ROUNDS):
+    """Возвращаем медиану нескольких прогонов для базовой линии."""
+    runs = [run(sizes) for _ in range(rounds)]
+    return {
+        key: _median([results[key] for results in runs]) for key in runs[0]
+    }
+
+
+def remeasure(keys, rounds):
+    """Перемеряем случаи keys rounds раз и возвращаем замеры по ключам."""
+    samples = {key: [] for key in keys}
+    for _ in range(rounds):
+        for size in sorted({int(key.rsplit('/', 1)[1]) for key in keys}):
+            for name, ops, func in cases(size):
+                key = f'{name}/{size}'
+                if key in samples:
+                    samples[key].append(measure(func, ops))
+    return samples
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for key, stats in results.items():
+        if key not in baseline:
+            continue
+        ratio = stats['ns_per_op'] / baseline[key]['ns_per_op']
+        if ratio > 1 + threshold:
+            regressions.append((key, ratio))
+    return regressions
+
+
+def confirm(results, baseline, threshold):
+    """Перепроверяем регрессии медианой стольких же прогонов, что в базе."""
+    regressions = compare(results, baseline, threshold)
+    if regressions:
+        samples = remeasure({key for key, _ in regressions}, SAVE_ROUNDS - 1)
+        for key, extra in samples.items():
+            results[key] = _median([results[key]] + extra)
+        regressions = compare(results, baseline, threshold)
+    for key, ratio in regressions:
+        print(f'REGRESSION {key}: x{ratio:.2f} к базовой линии')
+    return not regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--save', action='store_true')
+    parser.add_argument('--compare', action='store_true')
+    parser.add_argument('--threshold', type=float, default=0.25)
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    results = settle(args.sizes) if args.save else run(args.sizes)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='UTF-8') as file:
+            baseline = json.load(file)
+    if args.save:
+        with open(args.baseline, 'w', encoding='UTF-8') as file:
+            json.dump({**baseline, **results}, file, indent=2, sort_keys=True)
+            file.write('\n')
+    elif args.compare and not confirm(results, baseline, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
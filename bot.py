@@ -1,12 +1,43 @@
 import logging
 import sys
+import threading
 import time
+from contextlib import contextmanager
+from functools import partial
 from http import HTTPStatus
 
-import requests
-import telegram
-
-from exceptions import OtherHTTPError, HTTPError, MessageError
+from alerts import ErrorAggregator
+from breaker import get_breaker, parse_retry_after
+from commands import CommandPoller
+from deadline import Deadline, current_deadline
+from delivery import DeliveryQueue, PendingDeliveries
+from digest import DigestQueue
+from exceptions import (
+    OtherHTTPError,
+    HTTPError,
+    MessageError,
+    ValidationError
+)
+from http_client import get_client
+from journal import Journal
+from logs import make_file_handler, make_log_pipeline
+from metrics import (
+    CYCLE_DEADLINE_SECONDS,
+    CYCLE_SECONDS,
+    ERRORS,
+    POLL_DELAY_SECONDS,
+    RETRY_PERIOD_SECONDS,
+    STAGE_SECONDS,
+    start_http_server
+)
+from models import Homework
+from profiling import PROFILER, install_signal
+from recording import close_recorder, get_recorder
+from scheduler import AdaptiveScheduler
+from schema import validate_homework, validate_response
+from state import StateCache, Transition
+from streaming import HomeworkStream
+from tenants import Tenant, TenantRegistry
 from config import (
     PRACTICUM_TOKEN,
     TELEGRAM_TOKEN,
@@ -14,19 +45,36 @@ from config import (
     RETRY_PERIOD,
     ENDPOINT,
     HEADERS,
-    HOMEWORK_VERDICTS
+    DEFAULT_LOCALE,
+    JOURNAL_FILE,
+    ERROR_WINDOW,
+    STREAM_AFTER,
+    STREAM_CHUNK_SIZE,
+    METRICS_PORT,
+    LOG_FILE,
+    LOG_LEVEL,
+    COMMANDS_ENABLED,
+    DIGEST_ENABLED,
+    HTTP_TIMEOUT,
+    CYCLE_DEADLINE,
+    SEND_TIMEOUT,
+    PROFILE_ON_START
 )
+from config import HOMEWORK_VERDICTS  # noqa: F401
 
-
-logging.basicConfig(
-    level=logging.DEBUG,
-    filename='main.log',
-    filemode='w',
-    format='%(asctime)s, %(levelname)s, %(message)s, %(name)s',
-    encoding='UTF-8'
+RETRY_AFTER_STATUSES = (
+    HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.SERVICE_UNAVAILABLE
 )
 
 
+def configure_logging(filename=LOG_FILE):
+    """Настраиваем запись логов в файл из фонового потока."""
+    handler, listener = make_log_pipeline(make_file_handler(filename))
+    logging.basicConfig(level=LOG_LEVEL, handlers=[handler], force=True)
+    listener.start()
+    return listener
+
+
 def check_tokens():
     """Проверяем наличие переменных."""
     if not all([PRACTICUM_TOKEN, TELEGRAM_TOKEN, TELEGRAM_CHAT_ID]):
@@ -36,97 +84,422 @@ def check_tokens():
 
 def send_message(bot, message):
     """Отправляем сообщение о статусе в телеграм."""
+    deliver_message(bot, TELEGRAM_CHAT_ID, message)
+
+
+@STAGE_SECONDS.time('send_message')
+def deliver_message(bot, chat_id, message):
+    """Отправляем сообщение в указанный чат телеграма."""
+    import telegram
+
     try:
-        bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=message)
+        bot.send_message(chat_id=chat_id, text=message, timeout=SEND_TIMEOUT)
         logging.debug('Сообщение отправлено.')
+        recorder = get_recorder()
+        if recorder is not None:
+            recorder.message(chat_id, message)
     except telegram.error.TelegramError as e:
-        logging.error(
-            f'Не удалось отправить сообщение: {str(e)}'
-        )
+        logging.error('Не удалось отправить сообщение: %s', e)
         raise MessageError('Ошибка отправки сообщения в Telegram') from e
 
 
+def _deliver_status(bot, chat_id, message):
+    send_message(bot, message)
+
+
 def get_api_answer(timestamp):
     """Получаем API с информацией о домашних работах."""
+    return fetch_homeworks(HEADERS, timestamp)
+
+
+def make_headers(practicum_token):
+    """Формируем заголовки запроса для токена Практикума."""
+    return {'Authorization': f'OAuth {practicum_token}'}
+
+
+def _check_status(breaker, status_code, headers):
+    """Учитываем код ответа в автомате эндпоинта и проверяем его."""
+    if status_code == HTTPStatus.OK:
+        breaker.record_success()
+        return
+    retry_after = None
+    if status_code in RETRY_AFTER_STATUSES:
+        retry_after = parse_retry_after(headers.get('Retry-After'))
+    if status_code in RETRY_AFTER_STATUSES or status_code >= 500:
+        breaker.record_failure(retry_after)
+    else:
+        breaker.record_success()
+    logging.error('Bad response: %s', status_code)
+    raise HTTPError('Bad response:', status_code, retry_after)
+
+
+@STAGE_SECONDS.time('get_api_answer')
+def fetch_homeworks(headers, timestamp, deadline=None):
+    """Запрашиваем статусы домашних работ с заданными заголовками.
+
+    Без deadline берется бюджет цикла из Deadline.run(), а вне него —
+    новый.
+    """
+    import requests
+
+    payload = {'from_date': timestamp}
+    deadline = deadline or current_deadline() or Deadline()
+    timeout = deadline.timeout('get_api_answer', *HTTP_TIMEOUT)
+    breaker = get_breaker(ENDPOINT)
+    breaker.before_call()
+    try:
+        status_code, data, response_headers = get_client().get_json(
+            ENDPOINT, headers=headers, params=payload, timeout=timeout,
+            deadline=deadline
+        )
+    except requests.RequestException:
+        breaker.record_failure()
+        raise OtherHTTPError('Ошибка связанная с запросом')
+    except BaseException:
+        breaker.record_failure()
+        raise
+    try:
+        recorder = get_recorder()
+        if recorder is not None:
+            recorder.response(headers, timestamp, status_code, data)
+    finally:
+        _check_status(breaker, status_code, response_headers)
+    return data
+
+
+@contextmanager
+def open_homework_stream(headers, timestamp):
+    """Открываем ответ API для потокового разбора работ."""
+    import requests
+
     payload = {'from_date': timestamp}
+    breaker = get_breaker(ENDPOINT)
+    breaker.before_call()
     try:
-        response = requests.get(ENDPOINT, headers=HEADERS, params=payload)
-        if response.status_code != HTTPStatus.OK:
-            logging.error(f'Bad response: {response.status_code}')
-            raise HTTPError('Bad response:', response.status_code)
-    except requests.exceptions.HTTPError:
-        raise OtherHTTPError(f'Bad response: {response.status_code}')
+        response = get_client().open_stream(
+            ENDPOINT, headers=headers, params=payload
+        )
     except requests.RequestException:
+        breaker.record_failure()
         raise OtherHTTPError('Ошибка связанная с запросом')
-    return response.json()
+    except BaseException:
+        breaker.record_failure()
+        raise
+    with response:
+        _check_status(breaker, response.status_code, response.headers)
+        try:
+            yield HomeworkStream(response.iter_content(STREAM_CHUNK_SIZE))
+        except requests.RequestException:
+            breaker.record_failure()
+            raise OtherHTTPError('Ошибка связанная с запросом')
 
 
+@STAGE_SECONDS.time('check_response')
 def check_response(response):
     """Проверяем API на соответствие документации."""
-    if not isinstance(response, dict):
-        logging.error('API response is not a dictionary')
-        raise TypeError('API response is not a dictionary')
-    if 'current_date' not in response:
-        logging.error('current_date is not in a response')
-        raise KeyError('current_date is not in a response')
-    if not isinstance(response['current_date'], int):
-        logging.error('current_date is not an integer')
-        raise TypeError('current_date is not a dictionary')
-    if 'homeworks' not in response:
-        logging.error('homeworks is not in a response')
-        raise KeyError('homeworks is not in a response')
-    if not isinstance(response['homeworks'], list):
-        logging.error('homeworks is not a list')
-        raise TypeError('homeworks is not a list')
+    try:
+        validate_response(response)
+    except ValidationError as error:
+        logging.error('Некорректный ответ API: %s', error)
+        raise
+
+
+def parse_homework(homework):
+    """Проверяем работу из ответа API и создаем ее запись."""
+    try:
+        validate_homework(homework)
+    except ValidationError as error:
+        logging.error('Некорректная домашняя работа: %s', error)
+        raise
+    logging.info('Статус работы обновлен')
+    return Homework.from_dict(homework)
 
 
 def parse_status(homework):
     """Обрабатываем API и создаем ответ о статусе."""
-    if 'homework_name' not in homework:
-        logging.error('Значение ключа homework_name не найдено')
-        raise KeyError('Значение ключа homework_name не найдено')
-    homework_name = homework['homework_name']
-    if 'status' not in homework:
-        logging.error('Ключ status не найден')
-        raise KeyError('Ключ status не найден')
-    status = homework['status']
-    if status not in HOMEWORK_VERDICTS:
-        logging.error(f'Неизвестный статус домашней работы: {status}')
-        raise ValueError(f'Неизвестный статус домашней работы: {status}')
-    verdict = HOMEWORK_VERDICTS.get(status)
-    logging.info('Статус работы обновлен')
-    return f'Изменился статус проверки работы "{homework_name}". {verdict}'
+    return parse_homework(homework).message()
+
+
+def _record_time(record):
+    return record.date_updated or ''
+
+
+def _transition(state, tenant_id, record):
+    if state is None:
+        return Transition(None, record, time.time())
+    return state.transition(tenant_id, record)
+
+
+@STAGE_SECONDS.time('parse_status')
+def pending_updates(homeworks, journal, tenant_id, locale=DEFAULT_LOCALE,
+                    state=None):
+    """Возвращаем новые переходы статусов в порядке обновления.
+
+    С таблицей state работы с уже известным статусом отсеиваются до
+    разбора, поэтому стоимость определяется числом изменений. Таблица
+    здесь не меняется: статус вносится в нее после доставки.
+    """
+    if state is not None:
+        homeworks = [
+            homework for homework in homeworks
+            if state.changed(tenant_id, homework)
+        ]
+    records = sorted(map(parse_homework, homeworks), key=_record_time)
+    updates = []
+    for record in records:
+        transition = _transition(state, tenant_id, record)
+        if transition is None:
+            continue
+        if not journal.delivered(tenant_id, record.homework_id, record.status):
+            updates.append((transition, record.message(locale)))
+    return updates
+
+
+def stream_updates(stream, journal, tenant_id, locale=DEFAULT_LOCALE,
+                   state=None):
+    """Отдаем новые переходы статусов по мере разбора ответа."""
+    for homework in stream:
+        if state is not None and not state.changed(tenant_id, homework):
+            continue
+        record = parse_homework(homework)
+        transition = _transition(state, tenant_id, record)
+        if transition is None:
+            continue
+        if not journal.delivered(tenant_id, record.homework_id, record.status):
+            yield transition, record.message(locale)
+
+
+def backfill(delivery, chat_id, headers, journal, pending, tenant_id,
+             timestamp, locale=DEFAULT_LOCALE, state=None):
+    """Потоково догоняем изменения за долгий период.
+
+    Работы уходят в порядке ответа API: упорядочить их по времени
+    обновления можно только прочитав ответ целиком. Курсор сдвигается,
+    когда все сообщения доставлены.
+    """
+    with open_homework_stream(headers, timestamp) as stream:
+        futures = enqueue_updates(
+            delivery, chat_id,
+            stream_updates(stream, journal, tenant_id, locale, state),
+            journal, pending, tenant_id, state
+        )
+    logging.info('Догнали %s работ с %s', stream.count, timestamp)
+    advance_cursor(journal, tenant_id, stream.current_date, futures)
+
+
+def _log_failure(future):
+    error = future.exception()
+    if error is not None:
+        ERRORS.inc(type(error).__name__)
+        logging.error('Сообщение не доставлено: %s', error)
+
+
+def _record_delivery(journal, state, tenant_id, record, future):
+    if future.exception() is not None:
+        _log_failure(future)
+        return
+    journal.record_status(
+        tenant_id, record.homework_id, record.status, record.name
+    )
+    if state is not None:
+        state.apply(tenant_id, record)
+
+
+def enqueue_updates(delivery, chat_id, updates, journal, pending, tenant_id,
+                    state=None):
+    """Ставим переходы в очередь и возвращаем Future каждого из них.
+
+    Журнал и таблица state обновляются после отправки. Переход, который
+    еще ждет отправки, повторно не ставится: возвращается его Future.
+    """
+    futures = []
+    for transition, message in updates:
+        record = transition.record
+        future, created = pending.submit(
+            (tenant_id, record.homework_id, transition.previous,
+             record.status, record.date_updated),
+            partial(delivery.submit, chat_id, message)
+        )
+        if created:
+            future.add_done_callback(partial(
+                _record_delivery, journal, state, tenant_id, record
+            ))
+        futures.append(future)
+    return futures
+
+
+def _record_cursor(journal, tenant_id, timestamp, futures):
+    if any(future.exception() is not None for future in futures):
+        return
+    current = journal.cursor(tenant_id, None)
+    if current is None or timestamp > current:
+        journal.record_cursor(tenant_id, timestamp)
+
+
+def advance_cursor(journal, tenant_id, timestamp, futures):
+    """Сдвигаем курсор, когда все Future пачки успешно завершились.
+
+    Если хоть одно сообщение не доставлено, курсор остается на месте и
+    следующий опрос получит эти работы снова. Курсор не сдвигается
+    назад, если пачки завершились не по порядку.
+    """
+    futures = set(futures)
+    waiting = set(futures)
+    lock = threading.Lock()
+
+    def done(future):
+        with lock:
+            waiting.discard(future)
+            if waiting:
+                return
+        _record_cursor(journal, tenant_id, timestamp, futures)
+
+    if not futures:
+        _record_cursor(journal, tenant_id, timestamp, futures)
+    for future in futures:
+        future.add_done_callback(done)
+
+
+def enqueue_message(delivery, chat_id, message):
+    """Ставим служебное сообщение в очередь отправки."""
+    delivery.submit(chat_id, message).add_done_callback(_log_failure)
+
+
+def _poll_cycle(updates_queue, journal, pending, tenant_id, timestamp,
+                state, scheduler):
+    """Выполняем один цикл опроса: запрос, разбор и постановку в очередь."""
+    if time.time() - timestamp > STREAM_AFTER:
+        backfill(
+            updates_queue, TELEGRAM_CHAT_ID, HEADERS, journal, pending,
+            tenant_id, timestamp, state=state
+        )
+        return
+    response_json = Deadline().run('get_api_answer', get_api_answer, timestamp)
+    check_response(response_json)
+    updates = pending_updates(
+        response_json['homeworks'], journal, tenant_id, state=state
+    )
+    futures = enqueue_updates(
+        updates_queue, TELEGRAM_CHAT_ID, updates, journal, pending,
+        tenant_id, state
+    )
+    if not updates:
+        logging.info('Обновлений статуса не найдено')
+    if response_json['homeworks']:
+        advance_cursor(
+            journal, tenant_id, response_json['current_date'], futures
+        )
+    scheduler.observe(response_json['homeworks'])
+
+
+def _start_digest(delivery):
+    """Запускаем сводки уведомлений, если они включены."""
+    if not DIGEST_ENABLED:
+        return None
+    digest = DigestQueue(delivery)
+    digest.start()
+    return digest
+
+
+def seed_state(state, journal, tenant_id):
+    """Заполняем таблицу state статусами арендатора из журнала."""
+    state.seed(tenant_id, [
+        Homework(homework_id, name, status)
+        for homework_id, status, name in journal.tenant_statuses(tenant_id)
+        if name is not None
+    ])
+
+
+def _start_commands(bot, state, tenant_id, delivery, journal):
+    """Запускаем ответы на команды в чате, если они включены."""
+    if not COMMANDS_ENABLED:
+        return None
+    registry = TenantRegistry([
+        Tenant(tenant_id, PRACTICUM_TOKEN, TELEGRAM_CHAT_ID)
+    ])
+    commands = CommandPoller(
+        bot, state, registry.by_chat, partial(enqueue_message, delivery),
+        journal
+    )
+    commands.start()
+    return commands
+
+
+def _stop(*services):
+    """Останавливаем запущенные фоновые службы по порядку."""
+    for service in services:
+        if service is not None:
+            service.stop()
 
 
 def main():
     """Основная логика работы бота."""
     logging.info('Программа запущена')
     check_tokens()
-    timestamp = int(time.time()) - RETRY_PERIOD
+    if METRICS_PORT:
+        start_http_server(METRICS_PORT)
+    RETRY_PERIOD_SECONDS.set(RETRY_PERIOD)
+    CYCLE_DEADLINE_SECONDS.set(CYCLE_DEADLINE)
+    if PROFILE_ON_START:
+        PROFILER.request()
+    journal = Journal(JOURNAL_FILE)
+    tenant_id = str(TELEGRAM_CHAT_ID)
+    started_from = int(time.time()) - RETRY_PERIOD
+    import telegram
+
     bot = telegram.Bot(token=TELEGRAM_TOKEN)
-    last_error_message = ''
-    while True:
-        try:
-            response_json = get_api_answer(timestamp)
-            check_response(response_json)
-            if response_json['homeworks']:
-                message = parse_status(response_json['homeworks'][0])
-                send_message(bot, message)
-                timestamp = response_json['current_date']
-            else:
-                logging.info('Обновлений статуса не найдено')
-        except Exception as error:
-            logging.error(f'Ошибка в работе программы: {error}')
-            error_message = f'Ошибка в работе программы: {error}'
-            if error_message != last_error_message:
-                send_message(bot, error_message)
-            last_error_message = error_message
-        finally:
-            time.sleep(RETRY_PERIOD)
+    delivery = DeliveryQueue(bot, deliver=_deliver_status)
+    delivery.start()
+    digest = _start_digest(delivery)
+    scheduler = AdaptiveScheduler()
+    pending = PendingDeliveries()
+    errors = ErrorAggregator(
+        partial(enqueue_message, delivery), window=ERROR_WINDOW
+    )
+    errors.start()
+    state = StateCache()
+    seed_state(state, journal, tenant_id)
+    commands = _start_commands(bot, state, tenant_id, delivery, journal)
+    try:
+        while True:
+            started = time.perf_counter()
+            PROFILER.begin()
+            try:
+                _poll_cycle(
+                    digest or delivery, journal, pending, tenant_id,
+                    journal.cursor(tenant_id, started_from), state,
+                    scheduler
+                )
+            except Exception as error:
+                ERRORS.inc(type(error).__name__)
+                error_message = f'Ошибка в работе программы: {error}'
+                logging.error(error_message)
+                errors.add(TELEGRAM_CHAT_ID, error)
+            finally:
+                PROFILER.end()
+                CYCLE_SECONDS.observe(time.perf_counter() - started)
+                delay = max(
+                    scheduler.next_delay(), get_breaker(ENDPOINT).retry_in()
+                )
+                POLL_DELAY_SECONDS.set(delay)
+                time.sleep(delay)
+    finally:
+        _stop(commands, digest, errors, delivery)
+        journal.close()
+        close_recorder()
 
 
 if __name__ == '__main__':
+    if '--startup-profile' in sys.argv:
+        from startup import print_startup_profile
+
+        print_startup_profile()
+        sys.exit()
+    listener = configure_logging()
+    install_signal()
     try:
         main()
     except KeyboardInterrupt:
         logging.info('Программа остановлена пользователем вручную')
+    finally:
+        listener.stop()
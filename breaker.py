@@ -0,0 +1,131 @@
+import random
+import threading
+import time
+
+from config import (
+    BREAKER_BACKOFF_BASE,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_MAX_BACKOFF,
+)
+from exceptions import CircuitOpenError
+from metrics import BREAKER_REJECTED, BREAKER_STATE
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+def parse_retry_after(value):
+    """Переводим заголовок Retry-After в секунды ожидания."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(date.timestamp() - time.time(), 0.0)
+
+
+class CircuitBreaker:
+    """Автомат closed/open/half-open для запросов к одному эндпоинту.
+
+    После threshold сбоев подряд запросы не отправляются, пока не
+    истечет пауза, выбранная по схеме decorrelated jitter; затем
+    пропускается один пробный запрос. Retry-After из ответов 429/503
+    удлиняет паузу до указанного сервером срока.
+    """
+
+    def __init__(self, name, threshold=BREAKER_FAILURE_THRESHOLD,
+                 base=BREAKER_BACKOFF_BASE, max_backoff=BREAKER_MAX_BACKOFF,
+                 clock=time.monotonic, rng=random):
+        self.name = name
+        self.threshold = threshold
+        self.base = base
+        self.max_backoff = max_backoff
+        self._clock = clock
+        self._rng = rng
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._backoff = base
+        self._open_until = 0.0
+        self._probe = False
+        self._set_state(CLOSED)
+
+    def _set_state(self, state):
+        self.state = state
+        BREAKER_STATE.set(STATE_VALUES[state], self.name)
+
+    def _remaining(self, now):
+        return max(self._open_until - now, 0.0)
+
+    def _jittered(self, delay):
+        return delay + self._rng.uniform(0, self.base)
+
+    def before_call(self):
+        """Проверяем, можно ли отправить запрос, иначе поднимаем ошибку."""
+        with self._lock:
+            now = self._clock()
+            if self.state == OPEN and now >= self._open_until:
+                self._set_state(HALF_OPEN)
+            if self.state == CLOSED:
+                return
+            if self.state == HALF_OPEN and not self._probe:
+                self._probe = True
+                return
+            retry_after = self._jittered(self._remaining(now))
+        BREAKER_REJECTED.inc(self.name)
+        raise CircuitOpenError(
+            f'Запросы к {self.name} приостановлены', retry_after
+        )
+
+    def record_success(self):
+        """Учитываем успешный ответ эндпоинта."""
+        with self._lock:
+            self._failures = 0
+            self._backoff = self.base
+            self._probe = False
+            if self.state != CLOSED:
+                self._set_state(CLOSED)
+
+    def record_failure(self, retry_after=None):
+        """Учитываем сбой; retry_after — срок из заголовка ответа."""
+        with self._lock:
+            self._failures += 1
+            self._probe = False
+            if (self.state == CLOSED and self._failures < self.threshold
+                    and retry_after is None):
+                return
+            self._backoff = min(
+                self.max_backoff,
+                self._rng.uniform(self.base, self._backoff * 3)
+            )
+            delay = max(self._backoff, retry_after or 0.0)
+            self._open_until = self._clock() + delay
+            self._set_state(OPEN)
+
+    def retry_in(self):
+        """Возвращаем, через сколько секунд имеет смысл повторить запрос."""
+        with self._lock:
+            if self.state == CLOSED:
+                return 0.0
+            return self._jittered(self._remaining(self._clock()))
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name):
+    """Возвращаем общий для процесса автомат эндпоинта name."""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name)
+        return breaker
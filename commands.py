@@ -0,0 +1,142 @@
+import logging
+import threading
+
+from config import (
+    COMMAND_REPLIES,
+    COMMANDS_POLL_TIMEOUT,
+    HISTORY_LIMIT,
+    LOCALIZED_VERDICTS,
+)
+from metrics import COMMANDS
+
+ERROR_PAUSE = 5
+
+
+def _line(record, locale):
+    return f'{record.name}: {LOCALIZED_VERDICTS[locale][record.status]}'
+
+
+def render_status_reply(records, locale):
+    """Собираем ответ на /status из последних статусов работ."""
+    replies = COMMAND_REPLIES[locale]
+    if not records:
+        return replies['empty']
+    return '\n'.join(
+        [replies['status']] + [_line(record, locale) for record in records]
+    )
+
+
+def render_history_reply(transitions, locale):
+    """Собираем ответ на /history из последних переходов."""
+    replies = COMMAND_REPLIES[locale]
+    if not transitions:
+        return replies['empty']
+    return '\n'.join([replies['history']] + [
+        f'{transition.record.date_updated or "—"} '
+        f'{_line(transition.record, locale)}'
+        for transition in transitions
+    ])
+
+
+def parse_command(text):
+    """Возвращаем имя команды без косой черты и имени бота."""
+    if not text or not text.startswith('/'):
+        return None
+    return text.split()[0][1:].split('@')[0].lower()
+
+
+class CommandPoller:
+    """Отвечаем на команды /status и /history из локального кэша.
+
+    Обновления читаются длинным опросом getUpdates в отдельном потоке.
+    Ответы строятся по StateCache без запросов к API Практикума;
+    сообщения из чужих чатов игнорируются. Если таблица пуста, а в
+    journal есть доставленные статусы арендатора, отвечаем, что статусы
+    пока неизвестны, а не что работ нет.
+    """
+
+    def __init__(self, bot, state, resolve, reply, journal=None,
+                 timeout=COMMANDS_POLL_TIMEOUT, history_limit=HISTORY_LIMIT):
+        self.bot = bot
+        self.state = state
+        self.journal = journal
+        self.timeout = timeout
+        self.history_limit = history_limit
+        self._resolve = resolve
+        self._reply = reply
+        self._offset = None
+        self._stopped = threading.Event()
+        self._thread = None
+        self._handlers = {
+            'status': self._status,
+            'start': self._status,
+            'history': self._history,
+        }
+
+    def _unknown(self, tenant):
+        return self.journal is not None and bool(
+            self.journal.tenant_statuses(tenant.tenant_id)
+        )
+
+    def _status(self, tenant):
+        records = self.state.latest(tenant.tenant_id)
+        if not records and self._unknown(tenant):
+            return COMMAND_REPLIES[tenant.locale]['unknown']
+        return render_status_reply(records, tenant.locale)
+
+    def _history(self, tenant):
+        transitions = self.state.history(
+            tenant.tenant_id, self.history_limit
+        )
+        if not transitions and self._unknown(tenant):
+            return COMMAND_REPLIES[tenant.locale]['no_history']
+        return render_history_reply(transitions, tenant.locale)
+
+    def handle(self, update):
+        """Отвечаем на одно обновление, если это известная команда."""
+        message = update.message
+        if message is None:
+            return
+        handler = self._handlers.get(parse_command(message.text))
+        if handler is None:
+            return
+        tenant = self._resolve(message.chat_id)
+        if tenant is None:
+            logging.debug('Команда из неизвестного чата %s', message.chat_id)
+            return
+        COMMANDS.inc(parse_command(message.text))
+        self._reply(message.chat_id, handler(tenant))
+
+    def poll_once(self):
+        """Читаем и обрабатываем очередную пачку обновлений."""
+        updates = self.bot.get_updates(
+            offset=self._offset, timeout=self.timeout,
+            allowed_updates=['message']
+        )
+        for update in updates:
+            self._offset = update.update_id + 1
+            try:
+                self.handle(update)
+            except Exception as error:
+                logging.error('Не удалось ответить на команду: %s', error)
+
+    def _run(self):
+        import telegram
+
+        while not self._stopped.is_set():
+            try:
+                self.poll_once()
+            except telegram.error.TelegramError as error:
+                logging.warning('Ошибка getUpdates: %s', error)
+                self._stopped.wait(ERROR_PAUSE)
+
+    def start(self):
+        """Запускаем поток чтения команд."""
+        self._thread = threading.Thread(
+            target=self._run, name='commands', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Останавливаем поток после текущего запроса getUpdates."""
+        self._stopped.set()
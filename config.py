@@ -9,11 +9,123 @@ TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
 
 RETRY_PERIOD = 600
-ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
+ENDPOINT = os.getenv(
+    'PRACTICUM_ENDPOINT',
+    'https://practicum.yandex.ru/api/user_api/homework_statuses/'
+)
 HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
+HTTP_TIMEOUT = (5, 30)
+CYCLE_DEADLINE = float(os.getenv('CYCLE_DEADLINE', 60))
+CONNECT_SHARE = 0.2
+SEND_TIMEOUT = float(os.getenv('SEND_TIMEOUT', 10))
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', 50))
 
 HOMEWORK_VERDICTS = {
     'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
     'reviewing': 'Работа взята на проверку ревьюером.',
     'rejected': 'Работа проверена: у ревьюера есть замечания.'
 }
+
+DEFAULT_LOCALE = 'ru'
+LOCALIZED_VERDICTS = {
+    'ru': HOMEWORK_VERDICTS,
+    'en': {
+        'approved': 'The work has been reviewed: the reviewer liked it. '
+                    'Hooray!',
+        'reviewing': 'The work has been taken for review.',
+        'rejected': 'The work has been reviewed: the reviewer has remarks.'
+    },
+}
+STATUS_MESSAGE_TEMPLATES = {
+    'ru': 'Изменился статус проверки работы "{name}". {verdict}',
+    'en': 'The review status of "{name}" has changed. {verdict}',
+}
+
+COMMAND_REPLIES = {
+    'ru': {
+        'status': 'Текущие статусы работ:',
+        'history': 'Последние изменения статусов:',
+        'empty': 'Статусов работ пока нет: бот еще не видел ваших работ.',
+        'unknown': (
+            'Статусы работ пока неизвестны: бот перезапущен и еще не '
+            'получил их от Практикума.'
+        ),
+        'no_history': 'С перезапуска бота статусы работ не менялись.',
+    },
+    'en': {
+        'status': 'Current review statuses:',
+        'history': 'Recent status changes:',
+        'empty': 'No statuses yet: the bot has not seen your works.',
+        'unknown': (
+            'Statuses are unknown yet: the bot has restarted and has not '
+            'received them from Practicum.'
+        ),
+        'no_history': 'No status changes since the bot restarted.',
+    },
+}
+
+TENANTS_FILE = os.getenv('TENANTS_FILE', 'tenants.json')
+TENANTS_RELOAD_INTERVAL = int(os.getenv('TENANTS_RELOAD_INTERVAL', 5))
+ENGINE_CONCURRENCY = int(os.getenv('ENGINE_CONCURRENCY', 50))
+
+JOURNAL_FILE = os.getenv('JOURNAL_FILE', 'journal.jsonl')
+JOURNAL_FSYNC_EVERY = 32
+JOURNAL_FSYNC_INTERVAL = 1.0
+JOURNAL_COMPACT_AFTER = 10000
+
+REVIEWING_RETRY_PERIOD = 120
+MAX_RETRY_PERIOD = 3600
+IDLE_BACKOFF_AFTER = 6 * 3600
+IDLE_BACKOFF_FACTOR = 1.5
+RETRY_JITTER = 0.1
+
+TELEGRAM_GLOBAL_RATE = 30
+TELEGRAM_CHAT_RATE = 1
+DELIVERY_WORKERS = int(os.getenv('DELIVERY_WORKERS', 4))
+DELIVERY_RETRIES = 5
+DELIVERY_BACKOFF = 1.0
+
+ERROR_WINDOW = int(os.getenv('ERROR_WINDOW', 300))
+
+STREAM_AFTER = 24 * 3600
+STREAM_CHUNK_SIZE = 64 * 1024
+
+METRICS_PORT = int(os.getenv('METRICS_PORT', 0))
+
+LOG_FILE = os.getenv('LOG_FILE', 'main.log')
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'DEBUG')
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')
+LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', 10 * 2 ** 20))
+LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', 5))
+LOG_ROTATE_WHEN = os.getenv('LOG_ROTATE_WHEN', '')
+
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_BACKOFF_BASE = 30
+BREAKER_MAX_BACKOFF = 3600
+
+COMMANDS_ENABLED = os.getenv('COMMANDS_ENABLED', '0') == '1'
+COMMANDS_POLL_TIMEOUT = 30
+STATE_HISTORY_SIZE = 50
+STATE_MAXSIZE = int(os.getenv('STATE_MAXSIZE', 100000))
+HISTORY_LIMIT = 10
+
+TELEGRAM_BASE_URL = os.getenv(
+    'TELEGRAM_BASE_URL', 'https://api.telegram.org/bot'
+)
+SHARD_WORKERS = int(os.getenv('SHARD_WORKERS', os.cpu_count() or 1))
+SHARD_VNODES = 128
+SHARD_HANDOFF_TIMEOUT = 30
+STARTUP_PROFILE_TOP = 15
+
+TELEGRAM_MESSAGE_LIMIT = 4096
+DIGEST_ENABLED = os.getenv('DIGEST_ENABLED', '0') == '1'
+DIGEST_WINDOW = float(os.getenv('DIGEST_WINDOW', 60))
+DIGEST_MAX_ITEMS = int(os.getenv('DIGEST_MAX_ITEMS', 20))
+
+RECORD_FILE = os.getenv('RECORD_FILE', '')
+REPLAY_REPORT_TOP = 10
+
+PROFILE_ON_START = os.getenv('PROFILE_ON_START', '0') == '1'
+PROFILE_CYCLES = int(os.getenv('PROFILE_CYCLES', 5))
+PROFILE_DIR = os.getenv('PROFILE_DIR', 'profiles')
+PROFILE_TOP = 25
@@ -0,0 +1,74 @@
+import threading
+import time
+from concurrent.futures import Future, wait
+
+from config import CONNECT_SHARE, CYCLE_DEADLINE
+from exceptions import DeadlineExceededError
+from profiling import PROFILER
+
+
+_local = threading.local()
+
+
+def current_deadline():
+    """Возвращаем Deadline, внутри run() которого идет вызов, или None."""
+    return getattr(_local, 'deadline', None)
+
+
+def _call(deadline, future, func, args):
+    _local.deadline = deadline
+    try:
+        result = PROFILER.call(func, *args)
+    except Exception as error:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+    finally:
+        _local.deadline = None
+
+
+class Deadline:
+    """Бюджет времени на один цикл опроса.
+
+    Таймауты соединения и чтения запросов берутся из остатка бюджета,
+    а run() возвращает управление не позже срока, даже если сокет
+    завис: вызов продолжается в фоновом потоке до своего таймаута, а
+    цикл получает DeadlineExceededError. Поток вызова фоновый, поэтому
+    зависший запрос не мешает завершению программы. Внутри вызова
+    бюджет доступен через current_deadline().
+    """
+
+    def __init__(self, budget=CYCLE_DEADLINE, clock=time.monotonic):
+        self.budget = budget
+        self._clock = clock
+        self._expires = clock() + budget
+
+    def remaining(self):
+        """Возвращаем остаток бюджета в секундах."""
+        return max(self._expires - self._clock(), 0.0)
+
+    def exceeded(self, stage):
+        """Возвращаем исключение о превышении срока на этапе stage."""
+        return DeadlineExceededError(
+            f'{stage} не уложился в {self.budget} с', stage, self.budget
+        )
+
+    def timeout(self, stage, connect, read):
+        """Возвращаем (connect, read) для запроса в пределах остатка."""
+        remaining = self.remaining()
+        if not remaining:
+            raise self.exceeded(stage)
+        connect = min(connect, remaining * CONNECT_SHARE)
+        return connect, min(read, remaining - connect)
+
+    def run(self, stage, func, *args):
+        """Вызываем func и ждем результата не дольше остатка бюджета."""
+        future = Future()
+        threading.Thread(
+            target=_call, args=(self, future, func, args),
+            name=f'deadline-{stage}', daemon=True
+        ).start()
+        done, _ = wait([future], timeout=self.remaining())
+        if not done:
+            raise self.exceeded(stage)
+        return future.result()
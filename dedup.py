@@ -0,0 +1,11 @@
+import re
+
+NUMBERS = re.compile(r'\d+')
+SPACES = re.compile(r'\s+')
+SIGNATURE_LENGTH = 200
+
+
+def error_signature(error):
+    """Приводим ошибку к виду, не зависящему от чисел и пробелов."""
+    message = SPACES.sub(' ', NUMBERS.sub('#', str(error))).strip()
+    return f'{type(error).__name__}: {message[:SIGNATURE_LENGTH]}'
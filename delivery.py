@@ -0,0 +1,213 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from config import (
+    DELIVERY_BACKOFF,
+    DELIVERY_RETRIES,
+    DELIVERY_WORKERS,
+    TELEGRAM_CHAT_RATE,
+    TELEGRAM_GLOBAL_RATE,
+)
+from exceptions import MessageError
+from metrics import QUEUE_DEPTH
+
+MAX_CHAT_BUCKETS = 10000
+
+
+class TokenBucket:
+    """Ограничитель частоты по алгоритму token bucket."""
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Забираем токен и возвращаем, сколько секунд ждать до отправки."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.capacity,
+                self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def set_rate(self, rate):
+        """Меняем частоту и емкость ведра на ходу."""
+        with self._lock:
+            self.rate = self.capacity = rate
+            self._tokens = min(self._tokens, rate)
+
+    def is_full(self):
+        """Проверяем, что ведро давно не использовалось."""
+        with self._lock:
+            idle = self._clock() - self._updated
+            return self._tokens + idle * self.rate >= self.capacity
+
+
+class Delivery:
+    """Сообщение в очереди на отправку."""
+
+    __slots__ = ('chat_id', 'text', 'future')
+
+    def __init__(self, chat_id, text):
+        self.chat_id = chat_id
+        self.text = text
+        self.future = Future()
+
+
+class PendingDeliveries:
+    """Future сообщений, отправка которых еще не завершилась.
+
+    Пока сообщение с ключом ждет отправки, повторный submit() с тем же
+    ключом возвращает его Future, а не ставит сообщение еще раз. После
+    завершения отправки ключ освобождается.
+    """
+
+    def __init__(self):
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._futures)
+
+    def submit(self, key, send):
+        """Возвращаем (Future, True), вызвав send(), или ждущий Future."""
+        with self._lock:
+            future = self._futures.get(key)
+            if future is not None:
+                return future, False
+            future = self._futures[key] = send()
+        future.add_done_callback(lambda _: self._release(key, future))
+        return future, True
+
+    def _release(self, key, future):
+        with self._lock:
+            if self._futures.get(key) is future:
+                del self._futures[key]
+
+
+class DeliveryQueue:
+    """Очередь отправки сообщений в телеграм с ограничением частоты.
+
+    Сообщения одного чата обрабатывает один и тот же поток, поэтому их
+    порядок сохраняется. Ошибки отправки повторяются с экспоненциальной
+    паузой, RetryAfter соблюдается. MessageError попадает в Future
+    сообщения только когда попытки исчерпаны.
+    """
+
+    def __init__(self, bot, deliver, workers=DELIVERY_WORKERS,
+                 retries=DELIVERY_RETRIES, backoff=DELIVERY_BACKOFF,
+                 global_rate=TELEGRAM_GLOBAL_RATE,
+                 chat_rate=TELEGRAM_CHAT_RATE, clock=time.monotonic):
+        self.bot = bot
+        self.retries = retries
+        self.backoff = backoff
+        self.chat_rate = chat_rate
+        self._deliver = deliver
+        self._clock = clock
+        self._global_bucket = TokenBucket(global_rate, clock=clock)
+        self._chat_buckets = {}
+        self._buckets_lock = threading.Lock()
+        self._queues = [queue.Queue() for _ in range(workers)]
+        self._threads = []
+
+    def start(self):
+        """Запускаем потоки отправки."""
+        QUEUE_DEPTH.set_function(self.depth, 'delivery')
+        for index, worker_queue in enumerate(self._queues):
+            thread = threading.Thread(
+                target=self._work, args=(worker_queue,),
+                name=f'delivery-{index}', daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=None):
+        """Дожидаемся отправки очереди и останавливаем потоки."""
+        for worker_queue in self._queues:
+            worker_queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def set_global_rate(self, rate):
+        """Меняем общий лимит частоты отправки."""
+        self._global_bucket.set_rate(rate)
+
+    def depth(self):
+        """Возвращаем число сообщений, ожидающих отправки."""
+        return sum(worker_queue.qsize() for worker_queue in self._queues)
+
+    def submit(self, chat_id, text):
+        """Ставим сообщение в очередь и возвращаем его Future."""
+        delivery = Delivery(chat_id, text)
+        index = hash(str(chat_id)) % len(self._queues)
+        self._queues[index].put(delivery)
+        return delivery.future
+
+    def _chat_bucket(self, chat_id):
+        with self._buckets_lock:
+            bucket = self._chat_buckets.get(chat_id)
+            if bucket is None:
+                if len(self._chat_buckets) >= MAX_CHAT_BUCKETS:
+                    self._chat_buckets = {
+                        key: value
+                        for key, value in self._chat_buckets.items()
+                        if not value.is_full()
+                    }
+                bucket = TokenBucket(self.chat_rate, clock=self._clock)
+                self._chat_buckets[chat_id] = bucket
+            return bucket
+
+    def _work(self, worker_queue):
+        while True:
+            delivery = worker_queue.get()
+            if delivery is None:
+                return
+            try:
+                self._send(delivery)
+            except Exception as error:
+                delivery.future.set_exception(error)
+            else:
+                delivery.future.set_result(None)
+
+    def _send(self, delivery):
+        import telegram
+
+        permanent_errors = (
+            telegram.error.BadRequest, telegram.error.Unauthorized
+        )
+        chat_bucket = self._chat_bucket(delivery.chat_id)
+        for attempt in range(self.retries + 1):
+            delay = max(chat_bucket.reserve(), self._global_bucket.reserve())
+            if delay:
+                time.sleep(delay)
+            try:
+                self._deliver(self.bot, delivery.chat_id, delivery.text)
+                return
+            except MessageError as error:
+                cause = error.__cause__
+                if isinstance(cause, permanent_errors):
+                    raise
+                if attempt == self.retries:
+                    raise
+                if isinstance(cause, telegram.error.RetryAfter):
+                    delay = cause.retry_after
+                else:
+                    delay = self.backoff * 2 ** attempt
+                logging.warning(
+                    'Повтор отправки в чат %s через %s с',
+                    delivery.chat_id, delay
+                )
+                time.sleep(delay)
@@ -0,0 +1,171 @@
+import threading
+import time
+from concurrent.futures import Future
+from functools import partial
+
+from config import DIGEST_MAX_ITEMS, DIGEST_WINDOW, TELEGRAM_MESSAGE_LIMIT
+from metrics import QUEUE_DEPTH
+
+SEPARATOR = '\n\n'
+
+
+def _cut(text, limit):
+    """Режем слишком длинный текст по строкам, а строки — по пробелам."""
+    pieces = []
+    while len(text) > limit:
+        cut = text.rfind('\n', 0, limit + 1)
+        if cut <= 0:
+            cut = text.rfind(' ', 0, limit + 1)
+        if cut <= 0:
+            cut = limit
+        pieces.append(text[:cut].rstrip())
+        text = text[cut:].lstrip()
+    pieces.append(text)
+    return pieces
+
+
+def split_digest(messages, limit=TELEGRAM_MESSAGE_LIMIT):
+    """Собираем сообщения в тексты не длиннее limit.
+
+    Возвращаем пары (текст, число сообщений, закончившихся в нем).
+    Сообщения не разрываются между текстами, кроме тех, что сами
+    длиннее limit.
+    """
+    chunks = []
+    parts, ended = [], 0
+    size = 0
+    for message in messages:
+        for piece in _cut(message, limit):
+            added = len(piece) + (len(SEPARATOR) if parts else 0)
+            if parts and size + added > limit:
+                chunks.append((SEPARATOR.join(parts), ended))
+                parts, ended, size = [], 0, 0
+                added = len(piece)
+            parts.append(piece)
+            size += added
+        ended += 1
+    if parts:
+        chunks.append((SEPARATOR.join(parts), ended))
+    return chunks
+
+
+class _Batch:
+    __slots__ = ('deadline', 'messages', 'futures')
+
+    def __init__(self, deadline):
+        self.deadline = deadline
+        self.messages = []
+        self.futures = []
+
+
+def _chain(futures, future):
+    error = future.exception()
+    for item in futures:
+        if error is None:
+            item.set_result(None)
+        else:
+            item.set_exception(error)
+
+
+class DigestQueue:
+    """Собираем уведомления одного чата в сводку перед отправкой.
+
+    Интерфейс как у DeliveryQueue: submit() возвращает Future
+    сообщения, который завершается после отправки сводки с ним.
+    Сводка уходит через window секунд после первого сообщения в ней
+    или сразу, когда набралось max_items сообщений. Слишком длинная
+    сводка делится на несколько сообщений по границам уведомлений.
+    """
+
+    def __init__(self, delivery, window=DIGEST_WINDOW,
+                 max_items=DIGEST_MAX_ITEMS, limit=TELEGRAM_MESSAGE_LIMIT,
+                 clock=time.monotonic):
+        self.delivery = delivery
+        self.window = window
+        self.max_items = max_items
+        self.limit = limit
+        self._clock = clock
+        self._batches = {}
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._thread = None
+
+    def start(self):
+        """Запускаем поток, отправляющий сводки по истечении окна."""
+        QUEUE_DEPTH.set_function(self.depth, 'digest')
+        self._thread = threading.Thread(
+            target=self._run, name='digest', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Отправляем накопленные сводки и останавливаем поток."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def depth(self):
+        """Возвращаем число сообщений, ожидающих сводки."""
+        with self._condition:
+            return sum(
+                len(batch.messages) for batch in self._batches.values()
+            )
+
+    def submit(self, chat_id, text):
+        """Добавляем сообщение в сводку чата и возвращаем его Future."""
+        future = Future()
+        with self._condition:
+            batch = self._batches.get(chat_id)
+            if batch is None:
+                batch = self._batches[chat_id] = _Batch(
+                    self._clock() + self.window
+                )
+                self._condition.notify()
+            batch.messages.append(text)
+            batch.futures.append(future)
+            if len(batch.messages) < self.max_items:
+                return future
+            del self._batches[chat_id]
+        self._send(chat_id, batch)
+        return future
+
+    def flush(self, now=None):
+        """Отправляем сводки, окно которых истекло к now (все — без now)."""
+        with self._condition:
+            due = [
+                chat_id for chat_id, batch in self._batches.items()
+                if now is None or batch.deadline <= now
+            ]
+            batches = [(chat_id, self._batches.pop(chat_id))
+                       for chat_id in due]
+        for chat_id, batch in batches:
+            self._send(chat_id, batch)
+
+    def _send(self, chat_id, batch):
+        start = 0
+        for text, ended in split_digest(batch.messages, self.limit):
+            futures = batch.futures[start:start + ended]
+            start += ended
+            self.delivery.submit(chat_id, text).add_done_callback(
+                partial(_chain, futures)
+            )
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if self._stopped:
+                    return
+                deadlines = [
+                    batch.deadline for batch in self._batches.values()
+                ]
+                timeout = (
+                    max(min(deadlines) - self._clock(), 0)
+                    if deadlines else None
+                )
+                if timeout is None or timeout > 0:
+                    self._condition.wait(timeout)
+            self.flush(self._clock())
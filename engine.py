@@ -0,0 +1,291 @@
+import asyncio
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from alerts import ErrorAggregator
+from bot import (
+    advance_cursor,
+    backfill,
+    check_response,
+    configure_logging,
+    deliver_message,
+    enqueue_message,
+    enqueue_updates,
+    fetch_homeworks,
+    make_headers,
+    pending_updates,
+    seed_state,
+)
+from breaker import get_breaker
+from config import (
+    COMMANDS_ENABLED,
+    CYCLE_DEADLINE,
+    ENDPOINT,
+    ENGINE_CONCURRENCY,
+    ERROR_WINDOW,
+    JOURNAL_FILE,
+    METRICS_PORT,
+    RETRY_PERIOD,
+    STREAM_AFTER,
+    TELEGRAM_BASE_URL,
+    TELEGRAM_GLOBAL_RATE,
+    TELEGRAM_TOKEN,
+    TENANTS_FILE,
+    TENANTS_RELOAD_INTERVAL,
+)
+from commands import CommandPoller
+from deadline import Deadline
+from delivery import DeliveryQueue, PendingDeliveries
+from digest import DigestQueue
+from journal import Journal
+from metrics import (
+    CYCLE_DEADLINE_SECONDS,
+    CYCLE_SECONDS,
+    ERRORS,
+    RETRY_PERIOD_SECONDS,
+    start_http_server
+)
+from recording import close_recorder
+from scheduler import AdaptiveScheduler
+from state import StateCache
+from tenants import TenantRegistry, TenantSource
+
+
+class TenantState:
+    """Состояние опроса одного арендатора.
+
+    timestamp — начало опроса, пока в журнале нет курсора арендатора.
+    """
+
+    __slots__ = ('timestamp', 'scheduler')
+
+    def __init__(self, timestamp, scheduler):
+        self.timestamp = timestamp
+        self.scheduler = scheduler
+
+
+class PollingEngine:
+    """Асинхронный движок, опрашивающий всех арендаторов в одном процессе.
+
+    Блокирующие запросы к API выполняются в пуле потоков, одновременно их
+    не больше concurrency. Сообщения уходят через очередь отправки и не
+    задерживают опрос.
+    """
+
+    def __init__(self, registry, bot, concurrency=ENGINE_CONCURRENCY,
+                 period=RETRY_PERIOD, fetch=fetch_homeworks,
+                 deliver=deliver_message, journal=None,
+                 commands=COMMANDS_ENABLED,
+                 global_rate=TELEGRAM_GLOBAL_RATE):
+        self.registry = registry
+        self.bot = bot
+        self.journal = journal if journal is not None else Journal()
+        self.period = period
+        self.concurrency = concurrency
+        self.commands_enabled = commands
+        self._fetch = fetch
+        self.delivery = DeliveryQueue(
+            bot, deliver=deliver, global_rate=global_rate
+        )
+        self.digest = DigestQueue(self.delivery)
+        self.pending = PendingDeliveries()
+        self.errors = ErrorAggregator(
+            partial(enqueue_message, self.delivery), window=ERROR_WINDOW
+        )
+        self.state = StateCache()
+        self.commands = CommandPoller(
+            bot, self.state, registry.by_chat,
+            partial(enqueue_message, self.delivery), self.journal
+        )
+        self._states = {}
+        self._tasks = {}
+        self._semaphore = None
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    async def _call(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _state(self, tenant):
+        state = self._states.get(tenant.tenant_id)
+        if state is None:
+            state = self._states[tenant.tenant_id] = TenantState(
+                self.journal.cursor(
+                    tenant.tenant_id, int(time.time() - self.period)
+                ),
+                AdaptiveScheduler(period=self.period)
+            )
+        return state
+
+    def _updates_queue(self, tenant):
+        return self.digest if tenant.digest else self.delivery
+
+    async def poll_once(self, tenant):
+        """Выполняем один цикл опроса арендатора."""
+        state = self._state(tenant)
+        started = time.perf_counter()
+        timestamp = self.journal.cursor(tenant.tenant_id, state.timestamp)
+        try:
+            if time.time() - timestamp > STREAM_AFTER:
+                await self._call(
+                    backfill, self._updates_queue(tenant), tenant.chat_id,
+                    make_headers(tenant.practicum_token), self.journal,
+                    self.pending, tenant.tenant_id, timestamp,
+                    tenant.locale, self.state
+                )
+                return
+            deadline = Deadline()
+            try:
+                response = await asyncio.wait_for(self._call(
+                    self._fetch, make_headers(tenant.practicum_token),
+                    timestamp, deadline
+                ), deadline.remaining())
+            except asyncio.TimeoutError:
+                raise deadline.exceeded('get_api_answer') from None
+            check_response(response)
+            updates = pending_updates(
+                response['homeworks'], self.journal, tenant.tenant_id,
+                tenant.locale, self.state
+            )
+            futures = enqueue_updates(
+                self._updates_queue(tenant), tenant.chat_id, updates,
+                self.journal, self.pending, tenant.tenant_id, self.state
+            )
+            if not updates:
+                logging.info(
+                    'Обновлений статуса не найдено: %s', tenant.tenant_id
+                )
+            if response['homeworks']:
+                advance_cursor(
+                    self.journal, tenant.tenant_id, response['current_date'],
+                    futures
+                )
+            state.scheduler.observe(response['homeworks'])
+        except Exception as error:
+            ERRORS.inc(type(error).__name__)
+            error_message = f'Ошибка в работе программы: {error}'
+            logging.error('%s: %s', tenant.tenant_id, error_message)
+            self.errors.add(tenant.chat_id, error)
+        finally:
+            CYCLE_SECONDS.observe(time.perf_counter() - started)
+
+    async def _tenant_loop(self, tenant):
+        while True:
+            async with self._semaphore:
+                await self.poll_once(tenant)
+            await asyncio.sleep(max(
+                self._state(tenant).scheduler.next_delay(),
+                get_breaker(ENDPOINT).retry_in()
+            ))
+
+    def add_tenant(self, tenant):
+        """Регистрируем или обновляем арендатора и запускаем его опрос."""
+        task = self._tasks.pop(tenant.tenant_id, None)
+        if task is not None:
+            task.cancel()
+        else:
+            seed_state(self.state, self.journal, tenant.tenant_id)
+        self.registry.add(tenant)
+        self._tasks[tenant.tenant_id] = asyncio.create_task(
+            self._tenant_loop(tenant)
+        )
+
+    def remove_tenant(self, tenant_id):
+        """Останавливаем опрос арендатора и убираем его из реестра."""
+        task = self._tasks.pop(tenant_id, None)
+        if task is not None:
+            task.cancel()
+        self._states.pop(tenant_id, None)
+        self.state.forget(tenant_id)
+        self.registry.remove(tenant_id)
+
+    def apply_changes(self, added, updated, removed):
+        """Применяем изменения списка арендаторов без перезапуска."""
+        for tenant_id in removed:
+            self.remove_tenant(tenant_id)
+        for tenant in added + updated:
+            self.add_tenant(tenant)
+        if added or updated or removed:
+            logging.info(
+                'Арендаторы обновлены: +%s ~%s -%s',
+                len(added), len(updated), len(removed)
+            )
+
+    async def watch(self, source, interval=TENANTS_RELOAD_INTERVAL):
+        """Периодически перечитываем источник арендаторов."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                changes = await self._call(source.poll)
+            except OSError as error:
+                logging.error('Источник арендаторов недоступен: %s', error)
+                continue
+            self.apply_changes(*changes)
+
+    async def run(self, duration=None, source=None):
+        """Запускаем опрос всех арендаторов реестра.
+
+        Если передан source, список арендаторов перечитывается из него
+        на ходу.
+        """
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self.delivery.start()
+        self.digest.start()
+        self.errors.start()
+        if self.commands_enabled:
+            self.commands.start()
+        RETRY_PERIOD_SECONDS.set(self.period)
+        CYCLE_DEADLINE_SECONDS.set(CYCLE_DEADLINE)
+        for tenant in self.registry:
+            self.add_tenant(tenant)
+        logging.info('Движок запущен, арендаторов: %s', len(self.registry))
+        watcher = None
+        if source is not None:
+            watcher = asyncio.create_task(self.watch(source))
+        try:
+            if duration is None:
+                await asyncio.Event().wait()
+            else:
+                await asyncio.sleep(duration)
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+            for tenant_id in list(self._tasks):
+                self._tasks.pop(tenant_id).cancel()
+            self._executor.shutdown(wait=False)
+            self.commands.stop()
+            self.digest.stop()
+            self.errors.stop()
+            self.delivery.stop()
+            self.journal.close()
+            close_recorder()
+
+
+def main():
+    """Запускаем многопользовательский движок опроса."""
+    if not TELEGRAM_TOKEN:
+        logging.critical('Отсутствуют обязательные переменные.')
+        sys.exit(1)
+    path = sys.argv[1] if len(sys.argv) > 1 else TENANTS_FILE
+    source = TenantSource(path)
+    registry = TenantRegistry(source.poll()[0])
+    if METRICS_PORT:
+        start_http_server(METRICS_PORT)
+    import telegram
+
+    bot = telegram.Bot(token=TELEGRAM_TOKEN, base_url=TELEGRAM_BASE_URL)
+    engine = PollingEngine(registry, bot, journal=Journal(JOURNAL_FILE))
+    asyncio.run(engine.run(source=source))
+
+
+if __name__ == '__main__':
+    listener = configure_logging()
+    try:
+        main()
+    except KeyboardInterrupt:
+        logging.info('Программа остановлена пользователем вручную')
+    finally:
+        listener.stop()
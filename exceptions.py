@@ -1,9 +1,10 @@
 class HTTPError(Exception):
     """Исключение, которое возникает при ошибках HTTP."""
 
-    def __init__(self, message, status_code):
+    def __init__(self, message, status_code, retry_after=None):
         self.message = message
         self.status_code = status_code
+        self.retry_after = retry_after
         super().__init__(self.message)
 
     def __str__(self):
@@ -18,9 +19,54 @@ class OtherHTTPError(Exception):
         super().__init__(self.message)
 
 
+class CircuitOpenError(OtherHTTPError):
+    """Исключение, когда запросы к API временно приостановлены."""
+
+    def __init__(self, message, retry_after):
+        self.retry_after = retry_after
+        super().__init__(message)
+
+
+class DeadlineExceededError(OtherHTTPError):
+    """Исключение, когда этап цикла не уложился в бюджет времени."""
+
+    def __init__(self, message, stage, budget):
+        self.stage = stage
+        self.budget = budget
+        super().__init__(message)
+
+
 class MessageError(Exception):
     """Класс для исключений, возникающих при ошибке отправке сообщения."""
 
     def __init__(self, message):
         self.message = message
         super().__init__(self.message)
+
+
+class ValidationError(Exception):
+    """Базовый класс ошибок проверки ответа API по схеме."""
+
+    def __init__(self, message, path):
+        self.message = message
+        self.path = path
+        super().__init__(f'{path}: {message}' if path else message)
+
+    def relocate(self, prefix):
+        """Возвращаем такую же ошибку с путем относительно prefix."""
+        return type(self)(self.message, prefix + self.path)
+
+
+class MissingKeyError(ValidationError, KeyError):
+    """Исключение для отсутствующего в ответе ключа."""
+
+    def __str__(self):
+        return Exception.__str__(self)
+
+
+class InvalidTypeError(ValidationError, TypeError):
+    """Исключение для значения неожиданного типа."""
+
+
+class InvalidValueError(ValidationError, ValueError):
+    """Исключение для недопустимого значения."""
@@ -0,0 +1,167 @@
+import json
+import threading
+from http import HTTPStatus
+
+from config import HTTP_POOL_SIZE, HTTP_TIMEOUT, STREAM_CHUNK_SIZE
+from metrics import HTTP_CONNECTIONS, HTTP_RESPONSES
+
+
+class CachedResponse:
+    """Валидаторы и тело последнего успешного ответа."""
+
+    __slots__ = ('params', 'etag', 'last_modified', 'data')
+
+    def __init__(self, params, etag, last_modified, data):
+        self.params = params
+        self.etag = etag
+        self.last_modified = last_modified
+        self.data = data
+
+
+class PracticumClient:
+    """HTTP-клиент с пулом соединений и условными запросами.
+
+    Соединения переиспользуются между циклами опроса, а при наличии
+    ETag/Last-Modified повторный запрос с теми же параметрами стоит
+    ответа 304 без тела. Число запросов, ответов 304 и новых соединений
+    выгружается в метрику homework_bot_http_connections.
+    """
+
+    def __init__(self, pool_size=HTTP_POOL_SIZE, timeout=HTTP_TIMEOUT):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers['Accept-Encoding'] = 'gzip, deflate'
+        self._adapter = HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size
+        )
+        self.session.mount('https://', self._adapter)
+        self.session.mount('http://', self._adapter)
+        self._cache = {}
+        self._lock = threading.Lock()
+        self.requests_sent = 0
+        self.not_modified = 0
+        self.new_connections = 0
+        _count_connections(self._adapter, self._connected)
+        for kind, func in (
+            ('requests', lambda: self.requests_sent),
+            ('not_modified', lambda: self.not_modified),
+            ('new', lambda: self.new_connections),
+            ('reused', self.reused_connections),
+        ):
+            HTTP_CONNECTIONS.set_function(func, kind)
+
+    def get_json(self, url, headers, params, timeout=None, deadline=None):
+        """Выполняем GET-запрос и возвращаем код ответа, JSON и заголовки.
+
+        С deadline тело читается частями и чтение прерывается, когда
+        бюджет цикла исчерпан, даже если сервер присылает данные
+        медленнее таймаута чтения.
+        """
+        key = (url, headers.get('Authorization'))
+        params_key = tuple(sorted(params.items()))
+        cached = self._cache.get(key)
+        if cached is not None and cached.params != params_key:
+            cached = None
+        request_headers = dict(headers)
+        if cached is not None:
+            if cached.etag:
+                request_headers['If-None-Match'] = cached.etag
+            if cached.last_modified:
+                request_headers['If-Modified-Since'] = cached.last_modified
+        response = self.session.get(
+            url, headers=request_headers, params=params,
+            timeout=timeout or self.timeout, stream=deadline is not None
+        )
+        with self._lock:
+            self.requests_sent += 1
+        HTTP_RESPONSES.inc(str(response.status_code))
+        if response.status_code == HTTPStatus.NOT_MODIFIED and cached:
+            with self._lock:
+                self.not_modified += 1
+            response.close()
+            return HTTPStatus.OK, cached.data, response.headers
+        if response.status_code != HTTPStatus.OK:
+            response.close()
+            return response.status_code, None, response.headers
+        if deadline is None:
+            data = response.json()
+        else:
+            data = json.loads(_read_body(response, deadline))
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            self._cache[key] = CachedResponse(
+                params_key, etag, last_modified, data
+            )
+        else:
+            self._cache.pop(key, None)
+        return response.status_code, data, response.headers
+
+    def open_stream(self, url, headers, params):
+        """Открываем ответ для потокового чтения тела."""
+        response = self.session.get(
+            url, headers=headers, params=params, timeout=self.timeout,
+            stream=True
+        )
+        with self._lock:
+            self.requests_sent += 1
+        HTTP_RESPONSES.inc(str(response.status_code))
+        return response
+
+    def reused_connections(self):
+        """Возвращаем число запросов, ушедших по открытому соединению."""
+        with self._lock:
+            return max(self.requests_sent - self.new_connections, 0)
+
+    def _connected(self):
+        with self._lock:
+            self.new_connections += 1
+
+    def close(self):
+        """Закрываем все соединения пула."""
+        self.session.close()
+
+
+def _count_connections(adapter, on_connect):
+    """Подменяем классы пулов адаптера, чтобы считать новые соединения."""
+    classes = adapter.poolmanager.pool_classes_by_scheme
+    for scheme, pool_class in list(classes.items()):
+        base = pool_class.ConnectionCls
+
+        def connect(self, base=base):
+            on_connect()
+            return base.connect(self)
+
+        classes[scheme] = type(pool_class.__name__, (pool_class,), {
+            'ConnectionCls': type(base.__name__, (base,), {
+                'connect': connect,
+            }),
+        })
+
+
+def _read_body(response, deadline):
+    """Читаем тело ответа, пока не истек бюджет цикла."""
+    chunks = []
+    with response:
+        for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+            if not deadline.remaining():
+                raise deadline.exceeded('get_api_answer')
+            chunks.append(chunk)
+    return b''.join(chunks)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Возвращаем общий для процесса HTTP-клиент."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = PracticumClient()
+    return _client
@@ -0,0 +1,182 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+from config import (
+    JOURNAL_COMPACT_AFTER,
+    JOURNAL_FSYNC_EVERY,
+    JOURNAL_FSYNC_INTERVAL,
+)
+
+CURSOR = 'c'
+STATUS = 's'
+
+
+class Journal:
+    """Журнал курсоров и доставленных статусов, только на дозапись.
+
+    Каждая запись сразу попадает в ОС, поэтому падение процесса ничего
+    не теряет; fsync выполняется пачками — раз в fsync_every записей или
+    fsync_interval секунд. Когда мертвых записей становится больше
+    compact_after, журнал переписывается снимком текущего состояния.
+    Без path журнал живет только в памяти. Писать в журнал можно из
+    нескольких потоков. Вместе со статусом сохраняется название работы,
+    чтобы после перезапуска бот мог ответить на /status.
+    """
+
+    def __init__(self, path=None, fsync_every=JOURNAL_FSYNC_EVERY,
+                 fsync_interval=JOURNAL_FSYNC_INTERVAL,
+                 compact_after=JOURNAL_COMPACT_AFTER):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.compact_after = compact_after
+        self.cursors = {}
+        self.statuses = {}
+        self.names = {}
+        self._records = 0
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._file = None
+        self._lock = threading.RLock()
+        if path is not None:
+            self._replay()
+            self._file = open(path, 'a', encoding='UTF-8')
+
+    def _apply(self, record):
+        if record[0] == CURSOR:
+            self.cursors[sys.intern(record[1])] = record[2]
+        elif record[0] == STATUS:
+            key = (sys.intern(record[1]), record[2])
+            self.statuses[key] = sys.intern(record[3])
+            if len(record) > 4:
+                self.names[key] = sys.intern(record[4])
+
+    def _replay(self):
+        if not os.path.exists(self.path):
+            return
+        good_offset = 0
+        with open(self.path, 'rb') as file:
+            for line in file:
+                try:
+                    self._apply(json.loads(line))
+                except (ValueError, IndexError):
+                    logging.warning(
+                        'Журнал %s обрезан после байта %s',
+                        self.path, good_offset
+                    )
+                    break
+                good_offset += len(line)
+                self._records += 1
+        if good_offset != os.path.getsize(self.path):
+            with open(self.path, 'r+b') as file:
+                file.truncate(good_offset)
+
+    def _append(self, record):
+        with self._lock:
+            self._write(record)
+
+    def _write(self, record):
+        self._apply(record)
+        if self._file is None:
+            return
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+        self._records += 1
+        self._pending += 1
+        if (
+            self._pending >= self.fsync_every
+            or time.monotonic() - self._last_sync >= self.fsync_interval
+        ):
+            self.sync()
+        live = len(self.cursors) + len(self.statuses)
+        if self._records - live > self.compact_after:
+            self._compact()
+
+    def cursor(self, tenant_id, default):
+        """Возвращаем сохраненный курсор арендатора."""
+        return self.cursors.get(tenant_id, default)
+
+    def delivered(self, tenant_id, homework_id, status):
+        """Проверяем, отправляли ли уже этот статус работы."""
+        return self.statuses.get((tenant_id, homework_id)) == status
+
+    def tenant_statuses(self, tenant_id):
+        """Возвращаем (работа, статус, название), доставленные арендатору.
+
+        Название None у записей, сделанных до того, как его стали
+        сохранять.
+        """
+        with self._lock:
+            return [
+                (homework_id, status,
+                 self.names.get((owner, homework_id)))
+                for (owner, homework_id), status in self.statuses.items()
+                if owner == tenant_id
+            ]
+
+    def record_cursor(self, tenant_id, timestamp):
+        """Сохраняем курсор опроса арендатора."""
+        if self.cursors.get(tenant_id) != timestamp:
+            self._append([CURSOR, tenant_id, timestamp])
+
+    def record_status(self, tenant_id, homework_id, status, name=None):
+        """Сохраняем доставленный статус работы и ее название."""
+        record = [STATUS, tenant_id, homework_id, status]
+        if name is not None:
+            record.append(name)
+        self._append(record)
+
+    def sync(self):
+        """Сбрасываем накопленные записи на диск."""
+        with self._lock:
+            if self._file is None or not self._pending:
+                return
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pending = 0
+            self._last_sync = time.monotonic()
+
+    def compact(self):
+        """Переписываем журнал снимком текущего состояния."""
+        with self._lock:
+            self._compact()
+
+    def _compact(self):
+        if self._file is None:
+            return
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='UTF-8') as file:
+            for tenant_id, timestamp in self.cursors.items():
+                file.write(json.dumps([CURSOR, tenant_id, timestamp]) + '\n')
+            for (tenant_id, homework_id), status in self.statuses.items():
+                record = [STATUS, tenant_id, homework_id, status]
+                name = self.names.get((tenant_id, homework_id))
+                if name is not None:
+                    record.append(name)
+                file.write(json.dumps(record, ensure_ascii=False) + '\n')
+            file.flush()
+            os.fsync(file.fileno())
+        self._file.close()
+        os.replace(tmp_path, self.path)
+        directory = os.open(os.path.dirname(os.path.abspath(self.path)),
+                            os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+        self._file = open(self.path, 'a', encoding='UTF-8')
+        self._records = len(self.cursors) + len(self.statuses)
+        self._pending = 0
+        logging.info('Журнал %s сжат до %s записей', self.path, self._records)
+
+    def close(self):
+        """Сбрасываем записи и закрываем файл журнала."""
+        with self._lock:
+            if self._file is not None:
+                self.sync()
+                self._file.close()
+                self._file = None
@@ -0,0 +1,76 @@
+import json
+import logging
+import queue
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+    RotatingFileHandler,
+    TimedRotatingFileHandler,
+)
+
+from config import (
+    LOG_BACKUP_COUNT,
+    LOG_FILE,
+    LOG_FORMAT,
+    LOG_MAX_BYTES,
+    LOG_ROTATE_WHEN,
+)
+
+TEXT_FORMAT = '%(asctime)s, %(levelname)s, %(message)s, %(name)s'
+
+
+class JsonFormatter(logging.Formatter):
+    """Форматтер, записывающий каждую запись одной строкой JSON."""
+
+    def format(self, record):
+        data = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            data['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False)
+
+
+class LazyQueueHandler(QueueHandler):
+    """Кладет запись в очередь, не форматируя ее в потоке вызова.
+
+    Очередь живет внутри процесса, поэтому сообщение и аргументы
+    склеиваются только в потоке QueueListener.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def make_file_handler(filename=LOG_FILE, log_format=LOG_FORMAT,
+                      max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT,
+                      when=LOG_ROTATE_WHEN):
+    """Создаем файловый обработчик с ротацией по размеру или времени."""
+    if when:
+        handler = TimedRotatingFileHandler(
+            filename, when=when, backupCount=backup_count, encoding='UTF-8'
+        )
+    else:
+        handler = RotatingFileHandler(
+            filename, maxBytes=max_bytes, backupCount=backup_count,
+            encoding='UTF-8'
+        )
+    if log_format == 'json':
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    return handler
+
+
+def make_log_pipeline(*handlers):
+    """Возвращаем обработчик очереди и слушателя, пишущего в handlers."""
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(
+        log_queue, *(handlers or (make_file_handler(),)),
+        respect_handler_level=True
+    )
+    return LazyQueueHandler(log_queue), listener
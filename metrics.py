@@ -0,0 +1,268 @@
+import bisect
+import logging
+import threading
+import time
+from functools import wraps
+
+DEFAULT_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60
+)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value):
+    return (
+        str(value).replace('\\', '\\\\').replace('"', '\\"')
+        .replace('\n', '\\n')
+    )
+
+
+def _format_labels(names, values, extra=''):
+    pairs = [
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """Базовый класс метрики с метками."""
+
+    kind = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=(),
+                 registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        (registry or REGISTRY).register(self)
+
+    def render(self):
+        """Возвращаем строки метрики в текстовом формате Prometheus."""
+        lines = [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.kind}',
+        ]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.extend(self._render_value(labels, value))
+        return lines
+
+    def _render_value(self, labels, value):
+        yield (
+            f'{self.name}{_format_labels(self.labelnames, labels)} '
+            f'{_format_number(value)}'
+        )
+
+
+class Counter(Metric):
+    """Монотонно растущий счетчик."""
+
+    kind = 'counter'
+
+    def inc(self, *labels, amount=1):
+        """Увеличиваем счетчик для набора меток."""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        """Возвращаем текущее значение счетчика."""
+        return self._values.get(labels, 0)
+
+
+class Gauge(Metric):
+    """Значение, которое может расти и убывать."""
+
+    kind = 'gauge'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._functions = {}
+
+    def set(self, value, *labels):
+        """Устанавливаем значение для набора меток."""
+        with self._lock:
+            self._values[labels] = value
+
+    def set_function(self, func, *labels):
+        """Вычисляем значение вызовом func в момент выгрузки."""
+        with self._lock:
+            self._functions[labels] = func
+
+    def render(self):
+        with self._lock:
+            functions = list(self._functions.items())
+        for labels, func in functions:
+            try:
+                self.set(func(), *labels)
+            except Exception as error:
+                logging.warning(
+                    'Метрика %s не вычислена: %s', self.name, error
+                )
+        return super().render()
+
+
+class Histogram(Metric):
+    """Гистограмма с фиксированными границами корзин."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(),
+                 buckets=DEFAULT_BUCKETS, registry=None):
+        super().__init__(name, documentation, labelnames, registry)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value, *labels):
+        """Учитываем наблюдение для набора меток."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [
+                    [0] * len(self.buckets), 0.0, 0
+                ]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def time(self, *labels):
+        """Декоратор, замеряющий длительность вызова функции."""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(time.perf_counter() - started, *labels)
+            return wrapper
+        return decorator
+
+    def _render_value(self, labels, value):
+        counts, total, count = value
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            le = f'le="{_format_number(bound)}"'
+            yield (
+                f'{self.name}_bucket'
+                f'{_format_labels(self.labelnames, labels, le)} {cumulative}'
+            )
+        label_text = _format_labels(self.labelnames, labels)
+        yield f'{self.name}_sum{label_text} {_format_number(total)}'
+        yield f'{self.name}_count{label_text} {count}'
+
+
+class Registry:
+    """Реестр метрик процесса."""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        """Добавляем метрику в реестр."""
+        self._metrics.append(metric)
+
+    def render(self):
+        """Возвращаем все метрики в текстовом формате Prometheus."""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+
+def _render_response(handler):
+    if handler.path.split('?')[0] != '/metrics':
+        handler.send_error(404)
+        return
+    body = handler.server.registry.render().encode()
+    handler.send_response(200)
+    handler.send_header('Content-Type', CONTENT_TYPE)
+    handler.send_header('Content-Length', str(len(body)))
+    handler.end_headers()
+    handler.wfile.write(body)
+
+
+def start_http_server(port, host='', registry=REGISTRY):
+    """Запускаем эндпоинт /metrics в фоновом потоке."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        do_GET = _render_response
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    server.registry = registry
+    threading.Thread(
+        target=server.serve_forever, name='metrics', daemon=True
+    ).start()
+    logging.info('Метрики доступны на порту %s', server.server_port)
+    return server
+
+
+STAGE_SECONDS = Histogram(
+    'homework_bot_stage_seconds',
+    'Длительность этапов цикла опроса.', ('stage',)
+)
+CYCLE_SECONDS = Histogram(
+    'homework_bot_cycle_seconds',
+    'Длительность цикла опроса без паузы.',
+    buckets=DEFAULT_BUCKETS + (120, 300, 600)
+)
+POLL_DELAY_SECONDS = Gauge(
+    'homework_bot_poll_delay_seconds',
+    'Пауза перед следующим опросом, выбранная планировщиком.'
+)
+RETRY_PERIOD_SECONDS = Gauge(
+    'homework_bot_retry_period_seconds', 'Базовый период опроса.'
+)
+ERRORS = Counter(
+    'homework_bot_errors_total',
+    'Исключения цикла опроса по классам.', ('exception',)
+)
+HTTP_RESPONSES = Counter(
+    'homework_bot_http_responses_total',
+    'Ответы API Практикума по HTTP-статусам.', ('status',)
+)
+HTTP_CONNECTIONS = Gauge(
+    'homework_bot_http_connections',
+    'Запросы HTTP-клиента к API: всего, ответов 304, новых и '
+    'переиспользованных соединений.', ('kind',)
+)
+QUEUE_DEPTH = Gauge(
+    'homework_bot_queue_depth',
+    'Число элементов в очередях.', ('queue',)
+)
+BREAKER_STATE = Gauge(
+    'homework_bot_breaker_state',
+    'Состояние автомата эндпоинта: 0 closed, 1 half-open, 2 open.',
+    ('endpoint',)
+)
+BREAKER_REJECTED = Counter(
+    'homework_bot_breaker_rejected_total',
+    'Запросы, не отправленные из-за открытого автомата.', ('endpoint',)
+)
+CYCLE_DEADLINE_SECONDS = Gauge(
+    'homework_bot_cycle_deadline_seconds',
+    'Бюджет времени на цикл опроса.'
+)
+COMMANDS = Counter(
+    'homework_bot_commands_total',
+    'Обработанные команды телеграма.', ('command',)
+)
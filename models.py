@@ -0,0 +1,65 @@
+import sys
+
+from config import (
+    DEFAULT_LOCALE,
+    LOCALIZED_VERDICTS,
+    STATUS_MESSAGE_TEMPLATES,
+)
+
+
+def _split_template(template, verdict):
+    prefix, suffix = template.split('{name}')
+    return prefix, suffix.replace('{verdict}', verdict)
+
+
+MESSAGE_PARTS = {
+    locale: {
+        status: _split_template(STATUS_MESSAGE_TEMPLATES[locale], verdict)
+        for status, verdict in verdicts.items()
+    }
+    for locale, verdicts in LOCALIZED_VERDICTS.items()
+}
+
+
+def homework_key(homework):
+    """Возвращаем ключ работы из словаря ответа API."""
+    return str(homework.get('id', homework.get('homework_name')))
+
+
+def render_status(name, status, locale=DEFAULT_LOCALE):
+    """Собираем сообщение о статусе из заранее подготовленного шаблона."""
+    prefix, suffix = MESSAGE_PARTS[locale][status]
+    return prefix + name + suffix
+
+
+class Homework:
+    """Компактная запись о домашней работе.
+
+    Статус и название интернированы, поэтому одинаковые строки у тысяч
+    записей хранятся в одном экземпляре.
+    """
+
+    __slots__ = ('homework_id', 'name', 'status', 'date_updated')
+
+    def __init__(self, homework_id, name, status, date_updated=None):
+        self.homework_id = homework_id
+        self.name = sys.intern(name)
+        self.status = sys.intern(status)
+        self.date_updated = date_updated
+
+    def __repr__(self):
+        return (
+            f'Homework({self.homework_id!r}, {self.name!r}, {self.status!r})'
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        """Создаем запись из уже проверенного словаря ответа API."""
+        return cls(
+            homework_key(data), str(data['homework_name']), data['status'],
+            data.get('date_updated')
+        )
+
+    def message(self, locale=DEFAULT_LOCALE):
+        """Возвращаем сообщение об изменении статуса."""
+        return render_status(self.name, self.status, locale)
@@ -0,0 +1,123 @@
+import io
+import logging
+import os
+import signal
+import threading
+import time
+
+from config import PROFILE_CYCLES, PROFILE_DIR, PROFILE_TOP
+
+
+class CycleProfiler:
+    """Профилирование нескольких ближайших циклов опроса по запросу.
+
+    request() только выставляет счетчик, поэтому его можно вызывать из
+    обработчика сигнала. Пока профилирование не запрошено, begin() и
+    end() сводятся к одной проверке атрибута. Запрошенные циклы
+    профилируются cProfile, а выделения памяти отслеживает
+    tracemalloc; после последнего цикла в directory пишутся .prof для
+    pstats/snakeviz и текстовый отчет с топом функций и памяти.
+    Вызовы в других потоках попадают в профиль через call().
+    """
+
+    def __init__(self, directory=PROFILE_DIR, top=PROFILE_TOP):
+        self.directory = directory
+        self.top = top
+        self.requested = 0
+        self._remaining = 0
+        self._profiles = []
+        self._profile = None
+        self._started_tracing = False
+        self._lock = threading.Lock()
+
+    def request(self, cycles=PROFILE_CYCLES):
+        """Запрашиваем профилирование следующих cycles циклов."""
+        self.requested = cycles
+
+    def begin(self):
+        """Отмечаем начало цикла опроса."""
+        if not self.requested and not self._remaining:
+            return
+        if not self._remaining:
+            self._start()
+        import cProfile
+
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def end(self):
+        """Отмечаем конец цикла и пишем отчет после последнего."""
+        if self._profile is None:
+            return
+        self._profile.disable()
+        with self._lock:
+            self._profiles.append(self._profile)
+        self._profile = None
+        self._remaining -= 1
+        if not self._remaining:
+            self._finish()
+
+    def call(self, func, *args):
+        """Вызываем func, профилируя ее, если идет профилирование."""
+        if not self._remaining:
+            return func(*args)
+        import cProfile
+
+        profile = cProfile.Profile()
+        try:
+            return profile.runcall(func, *args)
+        finally:
+            with self._lock:
+                self._profiles.append(profile)
+
+    def _start(self):
+        import tracemalloc
+
+        self._remaining, self.requested = self.requested, 0
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+        logging.info('Профилирование %s циклов начато', self._remaining)
+
+    def _finish(self):
+        import pstats
+        import tracemalloc
+
+        snapshot = tracemalloc.take_snapshot()
+        if self._started_tracing:
+            tracemalloc.stop()
+        with self._lock:
+            profiles, self._profiles = self._profiles, []
+        name = os.path.join(
+            self.directory,
+            f'profile-{os.getpid()}-{time.strftime("%Y%m%d-%H%M%S")}'
+        )
+        report = io.StringIO()
+        stats = pstats.Stats(*profiles, stream=report)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            stats.dump_stats(f'{name}.prof')
+            stats.sort_stats('cumulative').print_stats(self.top)
+            report.write(f'\ntracemalloc, топ-{self.top} по строкам:\n')
+            for statistic in snapshot.statistics('lineno')[:self.top]:
+                report.write(f'{statistic}\n')
+            with open(f'{name}.txt', 'w', encoding='UTF-8') as file:
+                file.write(report.getvalue())
+        except OSError as error:
+            logging.error('Не удалось записать профиль: %s', error)
+            return
+        logging.info('Профиль записан в %s.prof и %s.txt', name, name)
+
+
+PROFILER = CycleProfiler()
+
+
+def install_signal(profiler=PROFILER, signum=getattr(signal, 'SIGUSR1', None)):
+    """Включаем профилирование по сигналу (по умолчанию SIGUSR1).
+
+    Вызывать только из главного потока: иначе signal.signal поднимет
+    ValueError.
+    """
+    if signum is None:
+        return
+    signal.signal(signum, lambda *_: profiler.request())
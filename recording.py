@@ -0,0 +1,103 @@
+import gzip
+import hashlib
+import json
+import logging
+import threading
+import time
+
+from config import RECORD_FILE
+
+RESPONSE = 'response'
+MESSAGE = 'message'
+
+
+def tenant_key(headers):
+    """Возвращаем обезличенный ключ токена из заголовков запроса."""
+    token = headers.get('Authorization', '').encode()
+    return hashlib.blake2b(token, digest_size=6).hexdigest()
+
+
+def open_traffic(path, mode):
+    """Открываем файл записи, сжатый gzip, если имя кончается на .gz."""
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='UTF-8')
+    return open(path, mode, encoding='UTF-8')
+
+
+def read_traffic(path):
+    """Читаем записи трафика по одной.
+
+    Оборванная последняя запись и недописанный конец .gz — следы
+    падения процесса — пропускаются с предупреждением.
+    """
+    with open_traffic(path, 'r') as file:
+        try:
+            for line in file:
+                if not line.endswith('\n'):
+                    logging.warning('Последняя запись в %s оборвана', path)
+                    return
+                if line.strip():
+                    yield json.loads(line)
+        except EOFError:
+            logging.warning('Файл %s оборван', path)
+
+
+class TrafficRecorder:
+    """Запись ответов API и отправленных сообщений в JSON lines.
+
+    Токены в файл не попадают: ответы помечаются ключом tenant_key().
+    Каждая запись сразу сбрасывается в файл, поэтому запись не теряется
+    при падении процесса. Писать можно из нескольких потоков.
+    """
+
+    def __init__(self, path, clock=time.time):
+        self.path = path
+        self._clock = clock
+        self._file = open_traffic(path, 'a')
+        self._lock = threading.Lock()
+
+    def _write(self, entry):
+        entry['at'] = self._clock()
+        line = json.dumps(entry, ensure_ascii=False, separators=(',', ':'))
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def response(self, headers, timestamp, status, data):
+        """Записываем ответ API на запрос с from_date=timestamp."""
+        self._write({
+            'kind': RESPONSE, 'tenant': tenant_key(headers),
+            'from_date': timestamp, 'status': status, 'data': data,
+        })
+
+    def message(self, chat_id, text):
+        """Записываем отправленное в телеграм сообщение."""
+        self._write({'kind': MESSAGE, 'chat_id': chat_id, 'text': text})
+
+    def close(self):
+        """Закрываем файл записи."""
+        with self._lock:
+            self._file.close()
+
+
+_recorder = None
+_recorder_lock = threading.Lock()
+
+
+def get_recorder():
+    """Возвращаем общий для процесса рекордер, если задан RECORD_FILE."""
+    global _recorder
+    if _recorder is None and RECORD_FILE:
+        with _recorder_lock:
+            if _recorder is None:
+                _recorder = TrafficRecorder(RECORD_FILE)
+    return _recorder
+
+
+def close_recorder():
+    """Закрываем общий рекордер, если он был открыт."""
+    global _recorder
+    with _recorder_lock:
+        recorder, _recorder = _recorder, None
+    if recorder is not None:
+        recorder.close()
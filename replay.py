@@ -0,0 +1,142 @@
+"""Воспроизведение записанного трафика без сети.
+
+Запись включается переменной RECORD_FILE: бот дописывает в файл каждый
+ответ API и каждое отправленное сообщение. Воспроизведение прогоняет
+ответы через check_response, разбор статусов и очередь отправки с
+ботом-заглушкой и сравнивает получившиеся сообщения с записанными.
+Паузы между ответами сжимаются в --speed раз, а с --speed 0 ответы
+идут без пауз — так трафик из продакшена годится и для бенчмарка.
+
+Запуск из корня репозитория:
+    python replay.py traffic.jsonl --speed 60
+"""
+import argparse
+import logging
+import time
+from collections import Counter
+from http import HTTPStatus
+
+from bot import check_response, enqueue_updates, pending_updates
+from config import REPLAY_REPORT_TOP, TELEGRAM_CHAT_RATE, TELEGRAM_GLOBAL_RATE
+from delivery import DeliveryQueue, PendingDeliveries
+from journal import Journal
+from recording import MESSAGE, RESPONSE, read_traffic
+from state import StateCache
+
+UNLIMITED_RATE = 1e9
+
+
+class ReplayBot:
+    """Бот-заглушка, запоминающий отправленные сообщения."""
+
+    def __init__(self):
+        self.sent = []
+
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        self.sent.append((chat_id, text))
+
+
+def _deliver(bot, chat_id, message):
+    bot.send_message(chat_id=chat_id, text=message)
+
+
+class ReplayReport:
+    """Итоги воспроизведения записи."""
+
+    def __init__(self, responses, errors, sent, recorded, elapsed):
+        self.responses = responses
+        self.errors = errors
+        self.sent = sent
+        self.recorded = recorded
+        self.elapsed = elapsed
+
+    def mismatches(self):
+        """Возвращаем сообщения, которых нет в записи, и наоборот."""
+        sent = Counter(text for _, text in self.sent)
+        recorded = Counter(text for _, text in self.recorded)
+        return sent - recorded, recorded - sent
+
+    def __str__(self):
+        extra, missing = self.mismatches()
+        rate = self.responses / self.elapsed if self.elapsed else 0.0
+        lines = [
+            f'ответов: {self.responses}, ошибок: '
+            f'{sum(self.errors.values())}',
+            f'сообщений: {len(self.sent)} отправлено, '
+            f'{len(self.recorded)} в записи',
+            f'время: {self.elapsed:.3f} с, {rate:.1f} ответов/с',
+        ]
+        for name, count in self.errors.most_common():
+            lines.append(f'  {name}: {count}')
+        for sign, texts in (('+', extra), ('-', missing)):
+            for text, count in texts.most_common(REPLAY_REPORT_TOP):
+                lines.append(f'{sign} {count} × {text}')
+        return '\n'.join(lines)
+
+
+def replay(path, speed=0.0, sleep=time.sleep):
+    """Воспроизводим запись path и возвращаем ReplayReport.
+
+    speed — во сколько раз сжимать паузы между записями; 0 — без пауз.
+    Ограничения частоты отправки сжимаются так же.
+    """
+    bot = ReplayBot()
+    scale = speed or UNLIMITED_RATE
+    delivery = DeliveryQueue(
+        bot, deliver=_deliver,
+        global_rate=TELEGRAM_GLOBAL_RATE * scale,
+        chat_rate=TELEGRAM_CHAT_RATE * scale
+    )
+    delivery.start()
+    journal = Journal()
+    state = StateCache()
+    pending = PendingDeliveries()
+    errors = Counter()
+    recorded = []
+    responses = 0
+    previous = None
+    started = time.perf_counter()
+    for entry in read_traffic(path):
+        if speed and previous is not None:
+            sleep(max(entry['at'] - previous, 0) / speed)
+        previous = entry['at']
+        if entry['kind'] == MESSAGE:
+            recorded.append((entry['chat_id'], entry['text']))
+            continue
+        if entry['kind'] != RESPONSE:
+            continue
+        responses += 1
+        if entry['status'] != HTTPStatus.OK:
+            errors[f'HTTP {entry["status"]}'] += 1
+            continue
+        tenant_id = entry['tenant']
+        try:
+            check_response(entry['data'])
+            updates = pending_updates(
+                entry['data']['homeworks'], journal, tenant_id, state=state
+            )
+        except Exception as error:
+            errors[type(error).__name__] += 1
+            continue
+        enqueue_updates(
+            delivery, tenant_id, updates, journal, pending, tenant_id, state
+        )
+    delivery.stop()
+    return ReplayReport(
+        responses, errors, bot.sent, recorded,
+        time.perf_counter() - started
+    )
+
+
+def main():
+    """Воспроизводим запись из командной строки и печатаем итоги."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument('path')
+    parser.add_argument('--speed', type=float, default=0.0)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    print(replay(args.path, args.speed))
+
+
+if __name__ == '__main__':
+    main()
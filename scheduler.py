@@ -0,0 +1,68 @@
+import random
+import time
+
+from config import (
+    IDLE_BACKOFF_AFTER,
+    IDLE_BACKOFF_FACTOR,
+    MAX_RETRY_PERIOD,
+    RETRY_JITTER,
+    RETRY_PERIOD,
+    REVIEWING_RETRY_PERIOD,
+)
+from models import homework_key
+
+REVIEWING = 'reviewing'
+
+
+class AdaptiveScheduler:
+    """Подбираем паузу перед следующим опросом.
+
+    Пока хотя бы одна работа на проверке, опрашиваем чаще. Если статусы
+    долго не меняются, пауза растет до max_period. К паузе добавляется
+    случайный разброс, чтобы арендаторы не опрашивали API одновременно.
+    """
+
+    def __init__(self, period=RETRY_PERIOD, fast_period=REVIEWING_RETRY_PERIOD,
+                 max_period=MAX_RETRY_PERIOD, idle_after=IDLE_BACKOFF_AFTER,
+                 backoff=IDLE_BACKOFF_FACTOR, jitter=RETRY_JITTER,
+                 clock=time.monotonic, rng=random):
+        self.period = period
+        self.fast_period = min(fast_period, period)
+        self.max_period = max(max_period, period)
+        self.idle_after = idle_after
+        self.backoff = backoff
+        self.jitter = jitter
+        self._clock = clock
+        self._rng = rng
+        self._reviewing = set()
+        self._last_change = clock()
+        self._idle_period = period
+
+    def observe(self, homeworks):
+        """Учитываем работы из очередного ответа API."""
+        if not homeworks:
+            return
+        self._last_change = self._clock()
+        self._idle_period = self.period
+        for homework in homeworks:
+            key = homework_key(homework)
+            if homework.get('status') == REVIEWING:
+                self._reviewing.add(key)
+            else:
+                self._reviewing.discard(key)
+
+    def base_delay(self):
+        """Возвращаем паузу без случайного разброса."""
+        if self._reviewing:
+            return self.fast_period
+        if self._clock() - self._last_change < self.idle_after:
+            return self.period
+        self._idle_period = min(
+            self._idle_period * self.backoff, self.max_period
+        )
+        return self._idle_period
+
+    def next_delay(self):
+        """Возвращаем паузу перед следующим опросом."""
+        delay = self.base_delay()
+        return delay * self._rng.uniform(1 - self.jitter, 1 + self.jitter)
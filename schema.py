@@ -0,0 +1,116 @@
+from config import HOMEWORK_VERDICTS
+from exceptions import (
+    InvalidTypeError,
+    InvalidValueError,
+    MissingKeyError,
+    ValidationError,
+)
+
+TYPE_NAMES = {
+    dict: 'a dictionary',
+    list: 'a list',
+    int: 'an integer',
+    str: 'a string',
+}
+
+RESPONSE_SCHEMA = {
+    'type': dict,
+    'keys': {
+        'current_date': {'type': int},
+        'homeworks': {'type': list},
+    },
+}
+
+HOMEWORK_SCHEMA = {
+    'type': dict,
+    'keys': {
+        'homework_name': {},
+        'status': {'enum': HOMEWORK_VERDICTS},
+    },
+}
+
+
+class _Compiler:
+    """Генератор исходного кода функции проверки по схеме."""
+
+    def __init__(self):
+        self.lines = []
+        self.namespace = {
+            'InvalidTypeError': InvalidTypeError,
+            'InvalidValueError': InvalidValueError,
+            'MissingKeyError': MissingKeyError,
+            'ValidationError': ValidationError,
+        }
+        self._names = 0
+
+    def name(self, prefix):
+        self._names += 1
+        return f'{prefix}{self._names}'
+
+    def const(self, value):
+        name = self.name('c')
+        self.namespace[name] = value
+        return name
+
+    def emit(self, indent, line):
+        self.lines.append('    ' * indent + line)
+
+    def build(self, schema, var, path, indent):
+        start = len(self.lines)
+        if 'type' in schema:
+            expected = schema['type']
+            message = (
+                f'expected {TYPE_NAMES.get(expected, expected.__name__)}'
+            )
+            self.emit(indent, f'if not isinstance({var}, '
+                              f'{self.const(expected)}):')
+            self.emit(indent + 1, f'raise InvalidTypeError('
+                                  f'{self.const(message)}, '
+                                  f'{self.const(path)})')
+        if 'enum' in schema:
+            self.emit(indent, f'if {var} not in '
+                              f'{self.const(frozenset(schema["enum"]))}:')
+            self.emit(indent + 1, f'raise InvalidValueError('
+                                  f'"unknown value %r" % ({var},), '
+                                  f'{self.const(path)})')
+        for key, key_schema in schema.get('keys', {}).items():
+            self.emit(indent, f'if {self.const(key)} not in {var}:')
+            self.emit(indent + 1, f'raise MissingKeyError('
+                                  f'{self.const(f"{key} is missing")}, '
+                                  f'{self.const(path)})')
+            if key_schema:
+                key_var = self.name('v')
+                self.emit(indent, f'{key_var} = {var}[{key!r}]')
+                self.build(key_schema, key_var, f'{path}.{key}', indent)
+        if 'items' in schema:
+            item, index = self.name('v'), self.name('i')
+            self.emit(indent, f'for {index}, {item} in enumerate({var}):')
+            self.emit(indent + 1, 'try:')
+            if not self.build(schema['items'], item, '', indent + 2):
+                self.emit(indent + 2, 'pass')
+            self.emit(indent + 1, 'except ValidationError as error:')
+            self.emit(indent + 2, f'raise error.relocate('
+                                  f'{self.const(path)} + "[%d]" % {index}'
+                                  f') from None')
+        return len(self.lines) > start
+
+
+def compile_schema(schema, path=''):
+    """Собираем из схемы функцию проверки значения.
+
+    Схема — словарь с необязательными ключами type, enum, keys
+    (обязательные ключи словаря и их схемы) и items (схема элементов
+    списка). По схеме один раз генерируется плоская функция без
+    вложенных вызовов; проверки идут в порядке объявления, а путь к
+    ошибочному элементу списка вычисляется только при ошибке.
+    """
+    compiler = _Compiler()
+    compiler.emit(0, 'def validate(value):')
+    if not compiler.build(schema, 'value', path, 1):
+        compiler.emit(1, 'pass')
+    exec('\n'.join(compiler.lines), compiler.namespace)
+    return compiler.namespace['validate']
+
+
+validate_response = compile_schema(RESPONSE_SCHEMA, 'response')
+validate_homework = compile_schema(HOMEWORK_SCHEMA, 'homework')
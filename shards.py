@@ -0,0 +1,383 @@
+import asyncio
+import bisect
+import hashlib
+import logging
+import multiprocessing
+import os
+import queue
+import re
+import sys
+import time
+
+from bot import configure_logging
+from config import (
+    JOURNAL_FILE,
+    LOG_FILE,
+    RETRY_PERIOD,
+    SHARD_HANDOFF_TIMEOUT,
+    SHARD_VNODES,
+    SHARD_WORKERS,
+    TELEGRAM_BASE_URL,
+    TELEGRAM_GLOBAL_RATE,
+    TELEGRAM_TOKEN,
+    TENANTS_FILE,
+    TENANTS_RELOAD_INTERVAL,
+)
+from engine import PollingEngine
+from journal import Journal
+from tenants import Tenant, TenantRegistry, TenantSource
+
+ADD = 'add'
+REMOVE = 'remove'
+RELEASED = 'released'
+RATE = 'rate'
+SHARD_JOURNAL = re.compile(r'shard-\d+')
+STOP = 'stop'
+
+
+def _hash(value):
+    return int.from_bytes(
+        hashlib.blake2b(value.encode(), digest_size=8).digest(), 'big'
+    )
+
+
+class HashRing:
+    """Кольцо консистентного хеширования с виртуальными узлами.
+
+    При добавлении или удалении узла переезжают только ключи, попавшие
+    на его участки кольца, — в среднем 1/N всех ключей.
+    """
+
+    def __init__(self, nodes=(), vnodes=SHARD_VNODES):
+        self.vnodes = vnodes
+        self._points = []
+        self._owners = []
+        for node in nodes:
+            self.add(node)
+
+    def __contains__(self, node):
+        return node in self._owners
+
+    def nodes(self):
+        """Возвращаем узлы кольца."""
+        return sorted(set(self._owners))
+
+    def add(self, node):
+        """Добавляем узел на кольцо."""
+        for replica in range(self.vnodes):
+            point = _hash(f'{node}#{replica}')
+            index = bisect.bisect(self._points, point)
+            self._points.insert(index, point)
+            self._owners.insert(index, node)
+
+    def remove(self, node):
+        """Убираем узел с кольца."""
+        pairs = [
+            (point, owner)
+            for point, owner in zip(self._points, self._owners)
+            if owner != node
+        ]
+        self._points = [point for point, _ in pairs]
+        self._owners = [owner for _, owner in pairs]
+
+    def node_for(self, key):
+        """Возвращаем узел, которому принадлежит ключ."""
+        if not self._points:
+            raise LookupError('На кольце нет узлов')
+        index = bisect.bisect(self._points, _hash(key)) % len(self._points)
+        return self._owners[index]
+
+
+def restore(journal, tenant_id, cursor, statuses):
+    """Переносим в журнал шарда курсор и статусы арендатора."""
+    if cursor is not None:
+        journal.record_cursor(tenant_id, cursor)
+    for homework_id, status, name in statuses:
+        if not journal.delivered(tenant_id, homework_id, status):
+            journal.record_status(tenant_id, homework_id, status, name)
+
+
+def load_saved_state(journal_file):
+    """Собираем курсоры и статусы арендаторов из журналов всех шардов.
+
+    Арендатор мог переехать между шардами, поэтому он встречается в
+    нескольких журналах; берется журнал с самым свежим курсором.
+    Возвращаем словарь tenant_id -> (курсор, [(работа, статус, название)]).
+    """
+    directory = os.path.dirname(os.path.abspath(journal_file))
+    prefix = f'{os.path.basename(journal_file)}.'
+    saved = {}
+    for filename in sorted(os.listdir(directory)):
+        if not (filename.startswith(prefix)
+                and SHARD_JOURNAL.fullmatch(filename[len(prefix):])):
+            continue
+        journal = Journal(os.path.join(directory, filename))
+        journal.close()
+        found = {
+            tenant_id: (cursor, [])
+            for tenant_id, cursor in journal.cursors.items()
+        }
+        for (tenant_id, homework_id), status in journal.statuses.items():
+            found.setdefault(tenant_id, (None, []))[1].append((
+                homework_id, status,
+                journal.names.get((tenant_id, homework_id))
+            ))
+        for tenant_id, (cursor, statuses) in found.items():
+            known = saved.get(tenant_id)
+            if known is None or (cursor or 0) > (known[0] or 0):
+                saved[tenant_id] = (cursor, statuses)
+    return saved
+
+
+async def _serve(engine, control, results):
+    runner = asyncio.create_task(engine.run())
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            command, *args = await loop.run_in_executor(None, control.get)
+            if command == STOP:
+                return
+            if command == ADD:
+                data, cursor, statuses = args
+                tenant = Tenant.from_dict(data)
+                restore(engine.journal, tenant.tenant_id, cursor, statuses)
+                engine.add_tenant(tenant)
+            elif command == REMOVE:
+                tenant_id, = args
+                engine.remove_tenant(tenant_id)
+                results.put((
+                    RELEASED, tenant_id,
+                    engine.journal.cursor(tenant_id, None),
+                    engine.journal.tenant_statuses(tenant_id)
+                ))
+            elif command == RATE:
+                rate, = args
+                engine.delivery.set_global_rate(rate)
+    finally:
+        runner.cancel()
+        try:
+            await runner
+        except asyncio.CancelledError:
+            pass
+
+
+def run_worker(name, tenants, control, results, journal_path, period,
+               global_rate, saved=None):
+    """Запускаем движок опроса для арендаторов одного шарда.
+
+    global_rate — доля шарда в общем лимите отправки бота, saved —
+    курсоры и статусы арендаторов из журналов других шардов.
+    """
+    import telegram
+
+    listener = configure_logging(f'{LOG_FILE}.{name}')
+    bot = telegram.Bot(token=TELEGRAM_TOKEN, base_url=TELEGRAM_BASE_URL)
+    journal = Journal(journal_path)
+    for tenant_id, (cursor, statuses) in (saved or {}).items():
+        restore(journal, tenant_id, cursor, statuses)
+    engine = PollingEngine(
+        TenantRegistry(Tenant.from_dict(data) for data in tenants), bot,
+        period=period, journal=journal, commands=False,
+        global_rate=global_rate
+    )
+    logging.info('Шард %s запущен, арендаторов: %s', name, len(tenants))
+    try:
+        asyncio.run(_serve(engine, control, results))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.stop()
+
+
+class ShardSupervisor:
+    """Распределяем арендаторов по процессам-шардам.
+
+    Каждый шард — отдельный процесс со своим движком опроса и своим
+    журналом, поэтому разбор JSON и проверка ответов не упираются в GIL
+    одного процесса. Арендатор закрепляется за шардом по кольцу
+    консистентного хеширования; при изменении числа шардов переезжают
+    только затронутые арендаторы, а их курсоры и доставленные статусы
+    передаются новому шарду. При запуске состояние арендаторов берется
+    из журналов всех шардов, так что смена их числа между запусками
+    ничего не теряет. Все шарды шлют сообщения от одного бота,
+    поэтому его общий лимит отправки делится между ними поровну.
+    """
+
+    def __init__(self, registry, workers=SHARD_WORKERS,
+                 journal_file=JOURNAL_FILE, period=RETRY_PERIOD,
+                 handoff_timeout=SHARD_HANDOFF_TIMEOUT, context=None):
+        self.registry = registry
+        self.journal_file = journal_file
+        self.period = period
+        self.handoff_timeout = handoff_timeout
+        self._context = context or multiprocessing.get_context('spawn')
+        self._results = self._context.Queue()
+        self._ring = HashRing(f'shard-{index}' for index in range(workers))
+        self._processes = {}
+        self._controls = {}
+        self._next_index = workers
+
+    def assignment(self):
+        """Возвращаем арендаторов каждого шарда."""
+        shards = {name: [] for name in self._ring.nodes()}
+        for tenant in self.registry:
+            shards[self._ring.node_for(tenant.tenant_id)].append(tenant)
+        return shards
+
+    def global_rate(self):
+        """Возвращаем долю общего лимита отправки на один шард."""
+        return TELEGRAM_GLOBAL_RATE / max(len(self._ring.nodes()), 1)
+
+    def _share_rate(self):
+        for control in self._controls.values():
+            control.put((RATE, self.global_rate()))
+
+    def _spawn(self, name, tenants, saved=None):
+        saved = saved or {}
+        control = self._context.Queue()
+        process = self._context.Process(
+            target=run_worker, name=name, daemon=True, args=(
+                name, [tenant.to_dict() for tenant in tenants], control,
+                self._results, f'{self.journal_file}.{name}', self.period,
+                self.global_rate(), {
+                    tenant.tenant_id: saved[tenant.tenant_id]
+                    for tenant in tenants if tenant.tenant_id in saved
+                }
+            )
+        )
+        process.start()
+        self._controls[name] = control
+        self._processes[name] = process
+
+    def start(self):
+        """Запускаем процессы шардов с состоянием из всех журналов."""
+        saved = load_saved_state(self.journal_file)
+        for name, tenants in self.assignment().items():
+            self._spawn(name, tenants, saved)
+
+    def _rebalance(self, before):
+        after = self.assignment()
+        owner_before = {
+            tenant.tenant_id: name
+            for name, tenants in before.items() for tenant in tenants
+        }
+        moves = {}
+        for name, tenants in after.items():
+            for tenant in tenants:
+                source = owner_before.get(tenant.tenant_id)
+                if source is not None and source != name:
+                    moves[tenant.tenant_id] = (tenant, source, name)
+        for tenant_id, (_, source, _) in moves.items():
+            self._controls[source].put((REMOVE, tenant_id))
+        handoffs = self._collect(set(moves))
+        for tenant_id, (tenant, _, target) in moves.items():
+            cursor, statuses = handoffs.get(tenant_id, (None, []))
+            self._controls[target].put(
+                (ADD, tenant.to_dict(), cursor, statuses)
+            )
+        logging.info('Перебалансировка: переехало %s арендаторов', len(moves))
+        return len(moves)
+
+    def _collect(self, tenant_ids):
+        handoffs = {}
+        while len(handoffs) < len(tenant_ids):
+            try:
+                _, tenant_id, cursor, statuses = self._results.get(
+                    timeout=self.handoff_timeout
+                )
+            except queue.Empty:
+                logging.error(
+                    'Шарды не вернули состояние %s арендаторов',
+                    len(tenant_ids) - len(handoffs)
+                )
+                break
+            if tenant_id not in tenant_ids:
+                logging.warning('Опоздавшее состояние %s отброшено', tenant_id)
+                continue
+            handoffs[tenant_id] = (cursor, statuses)
+        return handoffs
+
+    def add_worker(self):
+        """Добавляем шард и переносим на него часть арендаторов."""
+        name = f'shard-{self._next_index}'
+        self._next_index += 1
+        before = self.assignment()
+        self._ring.add(name)
+        self._share_rate()
+        self._spawn(name, [])
+        self._rebalance(before)
+        return name
+
+    def remove_worker(self, name):
+        """Переносим арендаторов шарда на остальные и останавливаем его."""
+        before = self.assignment()
+        self._ring.remove(name)
+        self._rebalance(before)
+        self._stop_worker(name)
+        self._share_rate()
+
+    def add_tenant(self, tenant):
+        """Регистрируем или обновляем арендатора на его шарде."""
+        cursor, statuses = self.remove_tenant(tenant.tenant_id)
+        self.registry.add(tenant)
+        name = self._ring.node_for(tenant.tenant_id)
+        self._controls[name].put((ADD, tenant.to_dict(), cursor, statuses))
+
+    def remove_tenant(self, tenant_id):
+        """Останавливаем опрос арендатора и возвращаем его состояние."""
+        if self.registry.remove(tenant_id) is None:
+            return None, []
+        name = self._ring.node_for(tenant_id)
+        self._controls[name].put((REMOVE, tenant_id))
+        return self._collect({tenant_id}).get(tenant_id, (None, []))
+
+    def _stop_worker(self, name, timeout=None):
+        self._controls.pop(name).put((STOP,))
+        self._processes.pop(name).join(timeout)
+
+    def apply_changes(self, added, updated, removed):
+        """Применяем изменения списка арендаторов без перезапуска шардов."""
+        for tenant_id in removed:
+            self.remove_tenant(tenant_id)
+        for tenant in added + updated:
+            self.add_tenant(tenant)
+        if added or updated or removed:
+            logging.info(
+                'Арендаторы обновлены: +%s ~%s -%s',
+                len(added), len(updated), len(removed)
+            )
+
+    def stop(self, timeout=None):
+        """Останавливаем все шарды."""
+        for name in list(self._processes):
+            self._stop_worker(name, timeout)
+
+
+def main():
+    """Запускаем опрос арендаторов в нескольких процессах."""
+    if not TELEGRAM_TOKEN:
+        logging.critical('Отсутствуют обязательные переменные.')
+        sys.exit(1)
+    path = sys.argv[1] if len(sys.argv) > 1 else TENANTS_FILE
+    source = TenantSource(path)
+    supervisor = ShardSupervisor(TenantRegistry(source.poll()[0]))
+    supervisor.start()
+    try:
+        while True:
+            time.sleep(TENANTS_RELOAD_INTERVAL)
+            try:
+                supervisor.apply_changes(*source.poll())
+            except OSError as error:
+                logging.error('Источник арендаторов недоступен: %s', error)
+    finally:
+        supervisor.stop(timeout=SHARD_HANDOFF_TIMEOUT)
+
+
+if __name__ == '__main__':
+    listener = configure_logging()
+    try:
+        main()
+    except KeyboardInterrupt:
+        logging.info('Программа остановлена пользователем вручную')
+    finally:
+        listener.stop()
@@ -0,0 +1,53 @@
+"""Профиль холодного старта: сколько стоит импорт каждого модуля.
+
+Импорт выполняется в отдельном интерпретаторе с -X importtime, чтобы
+уже загруженные модули текущего процесса не искажали замер. Первая
+фаза — то, что нужно до check_tokens(), вторая — модули, которые бот
+загружает при первом использовании.
+"""
+import subprocess
+import sys
+
+from config import STARTUP_PROFILE_TOP
+
+PHASES = (
+    ('до check_tokens()', ('bot',)),
+    ('при первом запросе', ('requests', 'telegram')),
+)
+
+
+def profile_imports(modules, python=sys.executable):
+    """Возвращаем (модуль, собственное время, общее время, глубина) в мкс."""
+    statement = '; '.join(f'import {module}' for module in modules)
+    result = subprocess.run(
+        [python, '-X', 'importtime', '-c', statement],
+        capture_output=True, text=True, check=True
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '[us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((name.strip(), int(own), int(cumulative), depth))
+    return entries
+
+
+def print_startup_profile(top=STARTUP_PROFILE_TOP):
+    """Печатаем стоимость импорта по фазам запуска и самые тяжелые модули."""
+    entries = profile_imports(
+        [module for _, modules in PHASES for module in modules]
+    )
+    roots = {name: cumulative for name, _, cumulative, depth in entries
+             if depth == 0}
+    for phase, modules in PHASES:
+        total = sum(roots.get(module, 0) for module in modules)
+        print(f'{phase:<24}{total / 1000:>8.1f} ms')
+        for module in modules:
+            print(f'  {module:<22}{roots.get(module, 0) / 1000:>8.1f} ms')
+    print(f'\nсамые тяжелые модули (собственное время, топ-{top}):')
+    for name, own, cumulative, _ in sorted(
+        entries, key=lambda entry: entry[1], reverse=True
+    )[:top]:
+        print(f'  {name:<40}{own / 1000:>8.1f} ms'
+              f'{cumulative / 1000:>10.1f} ms с вложенными')
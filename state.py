@@ -0,0 +1,155 @@
+import threading
+import time
+from collections import OrderedDict, deque
+
+from config import STATE_HISTORY_SIZE, STATE_MAXSIZE
+from models import homework_key
+
+
+class Transition:
+    """Переход работы из одного статуса в другой."""
+
+    __slots__ = ('previous', 'record', 'seen_at')
+
+    def __init__(self, previous, record, seen_at):
+        self.previous = previous
+        self.record = record
+        self.seen_at = seen_at
+
+    def __repr__(self):
+        return (
+            f'Transition({self.record.homework_id!r}, '
+            f'{self.previous!r} -> {self.record.status!r})'
+        )
+
+
+def _is_transition(known, record):
+    if known is None:
+        return True
+    if known.status == record.status:
+        return False
+    return not (known.date_updated and record.date_updated
+                and record.date_updated < known.date_updated)
+
+
+class StateCache:
+    """Таблица последних статусов работ с историей переходов.
+
+    Записи проиндексированы по арендатору и id работы. Ответ API
+    сравнивается с таблицей: работы с известным статусом отсеиваются
+    одним поиском в словаре, а переходом считается только новый статус
+    с датой обновления не раньше известной. Поэтому повторы и
+    переставленные записи перекрывающихся окон не дают уведомлений.
+    В таблицу попадают только доставленные статусы, поэтому она же
+    отвечает на команды без запроса к Практикуму. Читать и писать можно
+    из разных потоков.
+
+    Больше maxsize работ таблица не хранит: давно не обновлявшиеся
+    вытесняются. Вытесненная работа снова разбирается при следующем
+    ответе, а повторное уведомление о ней отсеивает журнал.
+    """
+
+    def __init__(self, history_size=STATE_HISTORY_SIZE,
+                 maxsize=STATE_MAXSIZE, clock=time.time):
+        self.history_size = history_size
+        self.maxsize = maxsize
+        self._clock = clock
+        self._homeworks = {}
+        self._order = OrderedDict()
+        self._history = {}
+        self._lock = threading.Lock()
+
+    def changed(self, tenant_id, homework):
+        """Проверяем, может ли работа из ответа API изменить таблицу."""
+        if not isinstance(homework, dict):
+            return True
+        known = self._homeworks.get(tenant_id, {}).get(homework_key(homework))
+        return known is None or known.status != homework.get('status')
+
+    def transition(self, tenant_id, record):
+        """Возвращаем переход, который внесла бы запись, или None.
+
+        Таблица не меняется: запись вносится apply() после доставки.
+        """
+        known = self._homeworks.get(tenant_id, {}).get(record.homework_id)
+        if not _is_transition(known, record):
+            return None
+        return Transition(
+            known.status if known is not None else None, record, self._clock()
+        )
+
+    def apply(self, tenant_id, record):
+        """Вносим запись в таблицу и возвращаем переход или None."""
+        with self._lock:
+            homeworks = self._homeworks.setdefault(tenant_id, {})
+            known = homeworks.get(record.homework_id)
+            if not _is_transition(known, record):
+                return None
+            homeworks[record.homework_id] = record
+            self._touch((tenant_id, record.homework_id))
+            transition = Transition(
+                known.status if known is not None else None, record,
+                self._clock()
+            )
+            history = self._history.get(tenant_id)
+            if history is None:
+                history = self._history[tenant_id] = deque(
+                    maxlen=self.history_size
+                )
+            history.append(transition)
+            return transition
+
+    def seed(self, tenant_id, records):
+        """Заполняем таблицу записями из журнала без истории переходов.
+
+        Уже известные таблице работы не меняются.
+        """
+        with self._lock:
+            homeworks = self._homeworks.setdefault(tenant_id, {})
+            for record in records:
+                if record.homework_id not in homeworks:
+                    homeworks[record.homework_id] = record
+                    self._touch((tenant_id, record.homework_id))
+            if not homeworks:
+                del self._homeworks[tenant_id]
+
+    def __len__(self):
+        return len(self._order)
+
+    def _touch(self, key):
+        self._order[key] = None
+        self._order.move_to_end(key)
+        while len(self._order) > self.maxsize:
+            tenant_id, homework_id = self._order.popitem(last=False)[0]
+            homeworks = self._homeworks[tenant_id]
+            del homeworks[homework_id]
+            if not homeworks:
+                del self._homeworks[tenant_id]
+
+    def latest(self, tenant_id):
+        """Возвращаем последние статусы работ, свежие первыми."""
+        with self._lock:
+            records = list(self._homeworks.get(tenant_id, {}).values())
+        return sorted(
+            records, key=lambda record: record.date_updated or '',
+            reverse=True
+        )
+
+    def history(self, tenant_id, limit=None, homework_id=None):
+        """Возвращаем последние переходы, свежие первыми."""
+        with self._lock:
+            transitions = list(self._history.get(tenant_id, ()))
+        transitions.reverse()
+        if homework_id is not None:
+            transitions = [
+                transition for transition in transitions
+                if transition.record.homework_id == homework_id
+            ]
+        return transitions[:limit]
+
+    def forget(self, tenant_id):
+        """Удаляем все данные арендатора."""
+        with self._lock:
+            for homework_id in self._homeworks.pop(tenant_id, ()):
+                del self._order[(tenant_id, homework_id)]
+            self._history.pop(tenant_id, None)
@@ -0,0 +1,131 @@
+import codecs
+import json
+import logging
+
+WHITESPACE = ' \t\n\r'
+
+_decoder = json.JSONDecoder()
+
+
+class HomeworkStream:
+    """Потоковый разбор ответа API по кускам тела.
+
+    Работы из списка homeworks отдаются по одной, как только они
+    прочитаны, поэтому в памяти держится только текущая работа и
+    недочитанный кусок ответа. Структура ответа проверяется по ходу
+    чтения с теми же исключениями, что и в check_response; отсутствие
+    ключей обнаруживается только в конце, после чего становится
+    доступен current_date.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._text = codecs.getincrementaldecoder('UTF-8')()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+        self._has_homeworks = False
+        self.current_date = None
+        self.count = 0
+
+    def _fail(self, error_class, message):
+        logging.error(message)
+        raise error_class(message)
+
+    def _fill(self):
+        if self._eof:
+            return False
+        if self._pos:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        for chunk in self._chunks:
+            text = self._text.decode(chunk)
+            if text:
+                self._buf += text
+                return True
+        self._buf += self._text.decode(b'', final=True)
+        self._eof = True
+        return False
+
+    def _peek(self):
+        while True:
+            buf = self._buf
+            while self._pos < len(buf) and buf[self._pos] in WHITESPACE:
+                self._pos += 1
+            if self._pos < len(buf):
+                return buf[self._pos]
+            if not self._fill():
+                return ''
+
+    def _expect(self, chars):
+        char = self._peek()
+        if not char or char not in chars:
+            raise json.JSONDecodeError(
+                f'Expecting one of {chars!r}', self._buf, self._pos
+            )
+        self._pos += 1
+        return char
+
+    def _value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def _homeworks(self):
+        if self._peek() != '[':
+            self._value()
+            self._fail(TypeError, 'homeworks is not a list')
+        self._pos += 1
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            self.count += 1
+            yield self._value()
+            if self._expect(',]') == ']':
+                return
+
+    def _field(self, key):
+        if key == 'homeworks':
+            self._has_homeworks = True
+            yield from self._homeworks()
+        elif key == 'current_date':
+            self.current_date = self._value()
+            if not isinstance(self.current_date, int):
+                self._fail(TypeError, 'current_date is not an integer')
+        else:
+            self._value()
+
+    def _fields(self):
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            if self._peek() != '"':
+                self._expect('"')
+            key = self._value()
+            self._expect(':')
+            yield from self._field(key)
+            if self._expect(',}') == '}':
+                return
+
+    def __iter__(self):
+        if self._peek() != '{':
+            self._fail(TypeError, 'API response is not a dictionary')
+        self._pos += 1
+        yield from self._fields()
+        if self._peek():
+            raise json.JSONDecodeError('Extra data', self._buf, self._pos)
+        if self.current_date is None:
+            self._fail(KeyError, 'current_date is not in a response')
+        if not self._has_homeworks:
+            self._fail(KeyError, 'homeworks is not in a response')
@@ -0,0 +1,199 @@
+import json
+import logging
+import os
+
+from config import DEFAULT_LOCALE, DIGEST_ENABLED
+
+
+class Tenant:
+    """Пара токен Практикума и чат телеграма, которую опрашивает бот."""
+
+    __slots__ = ('tenant_id', 'practicum_token', 'chat_id', 'locale',
+                 'digest')
+
+    def __init__(self, tenant_id, practicum_token, chat_id,
+                 locale=DEFAULT_LOCALE, digest=DIGEST_ENABLED):
+        self.tenant_id = str(tenant_id)
+        self.practicum_token = practicum_token
+        self.chat_id = chat_id
+        self.locale = locale
+        self.digest = digest
+
+    def __eq__(self, other):
+        if not isinstance(other, Tenant):
+            return NotImplemented
+        return (
+            self.tenant_id == other.tenant_id
+            and self.practicum_token == other.practicum_token
+            and self.chat_id == other.chat_id
+            and self.locale == other.locale
+            and self.digest == other.digest
+        )
+
+    def __hash__(self):
+        return hash(self.tenant_id)
+
+    def __repr__(self):
+        return f'Tenant({self.tenant_id!r}, chat_id={self.chat_id!r})'
+
+    def to_dict(self):
+        """Возвращаем словарь конфигурации арендатора."""
+        return {
+            'tenant_id': self.tenant_id,
+            'practicum_token': self.practicum_token,
+            'chat_id': self.chat_id,
+            'locale': self.locale,
+            'digest': self.digest,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Создаем арендатора из словаря конфигурации."""
+        for key in ('practicum_token', 'chat_id'):
+            if key not in data:
+                raise KeyError(f'В описании арендатора нет ключа {key}')
+        tenant_id = data.get('tenant_id', data['chat_id'])
+        return cls(
+            tenant_id, data['practicum_token'], data['chat_id'],
+            data.get('locale', DEFAULT_LOCALE),
+            bool(data.get('digest', DIGEST_ENABLED))
+        )
+
+
+class TenantRegistry:
+    """Реестр арендаторов, которых опрашивает движок."""
+
+    def __init__(self, tenants=()):
+        self._tenants = {}
+        self._by_chat = {}
+        for tenant in tenants:
+            self.add(tenant)
+
+    def __len__(self):
+        return len(self._tenants)
+
+    def __iter__(self):
+        return iter(list(self._tenants.values()))
+
+    def __contains__(self, tenant_id):
+        return tenant_id in self._tenants
+
+    def get(self, tenant_id):
+        """Возвращаем арендатора по идентификатору."""
+        return self._tenants.get(tenant_id)
+
+    def by_chat(self, chat_id):
+        """Возвращаем арендатора, которому принадлежит чат."""
+        return self._by_chat.get(str(chat_id))
+
+    def add(self, tenant):
+        """Добавляем или заменяем арендатора."""
+        self.remove(tenant.tenant_id)
+        self._tenants[tenant.tenant_id] = tenant
+        self._by_chat[str(tenant.chat_id)] = tenant
+
+    def remove(self, tenant_id):
+        """Удаляем арендатора, если он зарегистрирован."""
+        tenant = self._tenants.pop(tenant_id, None)
+        if tenant is not None:
+            self._by_chat.pop(str(tenant.chat_id), None)
+        return tenant
+
+    @classmethod
+    def from_file(cls, path):
+        """Загружаем реестр из JSON-файла со списком арендаторов."""
+        return cls(load_tenants(path).values())
+
+
+def load_tenants(path):
+    """Читаем арендаторов из JSON-файла со списком или одним объектом."""
+    with open(path, encoding='UTF-8') as file:
+        data = json.load(file)
+    if isinstance(data, dict):
+        data = [data]
+    if not isinstance(data, list):
+        raise TypeError('Файл арендаторов должен содержать список')
+    tenants = {}
+    for item in data:
+        tenant = Tenant.from_dict(item)
+        tenants[tenant.tenant_id] = tenant
+    return tenants
+
+
+class TenantSource:
+    """Описания арендаторов в файле или каталоге *.json с перечитыванием.
+
+    poll() проверяет mtime и размер файлов и перечитывает только
+    изменившиеся, а возвращает только затронутых арендаторов. Файл,
+    который не удалось прочитать, пропускается до следующего изменения,
+    а его арендаторы продолжают работать со старыми настройками.
+    Арендатор, пропавший из одного файла, но описанный в другом,
+    остается с настройками из другого файла.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.tenants = {}
+        self._files = {}
+
+    def _stats(self):
+        if not os.path.isdir(self.path):
+            return {self.path: os.stat(self.path)}
+        return {
+            entry.path: entry.stat()
+            for entry in os.scandir(self.path)
+            if entry.name.endswith('.json') and entry.is_file()
+        }
+
+    def _reload(self, path, stat, changed):
+        signature = (stat.st_mtime_ns, stat.st_size)
+        known = self._files.get(path)
+        if known is not None and known[0] == signature:
+            return
+        try:
+            tenants = load_tenants(path)
+        except (OSError, ValueError, KeyError, TypeError) as error:
+            logging.error('Не удалось прочитать %s: %s', path, error)
+            self._files[path] = (signature, known[1] if known else {})
+            return
+        self._files[path] = (signature, tenants)
+        if known is not None:
+            for tenant_id in known[1].keys() - tenants.keys():
+                changed.setdefault(tenant_id, None)
+        changed.update(tenants)
+
+    def _find(self, tenant_id):
+        for _, tenants in self._files.values():
+            if tenant_id in tenants:
+                return tenants[tenant_id]
+        return None
+
+    def _apply(self, changed):
+        added, updated, removed = [], [], []
+        for tenant_id, tenant in changed.items():
+            current = self.tenants.get(tenant_id)
+            if tenant is None:
+                tenant = self._find(tenant_id)
+            if tenant is None:
+                if current is not None:
+                    del self.tenants[tenant_id]
+                    removed.append(tenant_id)
+            elif current is None:
+                self.tenants[tenant_id] = tenant
+                added.append(tenant)
+            elif current != tenant:
+                self.tenants[tenant_id] = tenant
+                updated.append(tenant)
+        return added, updated, removed
+
+    def poll(self):
+        """Возвращаем добавленных, измененных и удаленных арендаторов."""
+        stats = self._stats()
+        changed = {}
+        for path in [path for path in self._files if path not in stats]:
+            _, tenants = self._files.pop(path)
+            for tenant_id in tenants:
+                changed.setdefault(tenant_id, None)
+        for path, stat in stats.items():
+            self._reload(path, stat, changed)
+        return self._apply(changed)
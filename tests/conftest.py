@@ -1,6 +1,8 @@
 import os
 import sys
 
+import pytest
+
 root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(root_dir)
 
@@ -25,3 +27,14 @@ os.environ['PRACTICUM_TOKEN'] = 'sometoken'
 os.environ['TELEGRAM_TOKEN'] = '1234:abcdefg'
 os.environ['TELEGRAM_CHAT_ID'] = '12345'
 
+
+@pytest.fixture(autouse=True)
+def journal_file(tmp_path, monkeypatch):
+    """Журнал main() пишется во временный каталог теста, а не в корень."""
+    import bot
+    import homework
+
+    path = str(tmp_path / 'journal.jsonl')
+    for module in (bot, homework):
+        monkeypatch.setattr(module, 'JOURNAL_FILE', path)
+    return path
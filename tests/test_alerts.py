@@ -0,0 +1,70 @@
+import threading
+
+from alerts import ErrorAggregator
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_first_error_is_sent_at_once_and_repeats_in_summary():
+    reports = []
+    done = threading.Event()
+
+    def report(chat_id, text):
+        reports.append((chat_id, text))
+        if len(reports) == 3:
+            done.set()
+
+    errors = ErrorAggregator(report, window=0.05)
+    errors.start()
+    errors.add(1, ValueError('timeout after 10 s'))
+    errors.add(2, ValueError('boom'))
+    assert reports == [
+        (1, 'Ошибка в работе программы: timeout after 10 s'),
+        (2, 'Ошибка в работе программы: boom'),
+    ]
+    errors.add(1, ValueError('timeout after 12 s'))
+    errors.add(1, ValueError('timeout after 14 s'))
+    errors.add(1, KeyError('homeworks'))
+    assert done.wait(5)
+    errors.stop()
+
+    assert len(reports) == 3
+    chat_id, summary = reports[2]
+    assert chat_id == 1
+    assert 'ValueError: timeout after # s — 2 раз' in summary
+    assert "KeyError: 'homeworks' — 1 раз" in summary
+
+
+def test_at_most_two_messages_per_window():
+    reports = []
+    clock = FakeClock()
+    errors = ErrorAggregator(
+        lambda *args: reports.append(args), window=60, clock=clock
+    )
+    for second in range(50):
+        clock.now = second
+        errors.add(1, ValueError('boom'))
+    clock.now = 60
+    for chat_id in errors._due(clock.now):
+        errors.flush(chat_id)
+    assert len(reports) == 2
+    assert 'ValueError: boom — 49 раз' in reports[1][1]
+
+    clock.now = 61
+    errors.add(1, ValueError('again'))
+    assert reports[2] == (1, 'Ошибка в работе программы: again')
+
+
+def test_window_without_repeats_sends_no_summary():
+    reports = []
+    errors = ErrorAggregator(lambda *args: reports.append(args), window=60)
+    errors.start()
+    errors.add(1, ValueError('boom'))
+    errors.stop()
+    assert reports == [(1, 'Ошибка в работе программы: boom')]
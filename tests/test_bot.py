@@ -8,6 +8,7 @@ import pytest
 import requests
 import telegram
 import utils
+from config import RETRY_JITTER
 
 
 def create_mock_response_get_with_custom_status_and_data(random_timestamp,
@@ -191,7 +192,7 @@ class TestHomework:
                     'Проверьте, что в параметре `from_date` передано число.'
                 )
 
-        monkeypatch.setattr(requests, 'get', check_request_get_call)
+        utils.patch_requests_get(monkeypatch, check_request_get_call)
         try:
             homework_module.get_api_answer(current_timestamp)
         except AssertionError as e:
@@ -214,7 +215,7 @@ class TestHomework:
                 current_timestamp=current_timestamp, **kwargs
             )
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        utils.patch_requests_get(monkeypatch, mock_response_get)
 
         result = homework_module.get_api_answer(current_timestamp)
         assert isinstance(result, dict), (
@@ -234,7 +235,7 @@ class TestHomework:
             self.HOMEWORK_FUNC_WITH_PARAMS_QTY[func_name]
         )
 
-        monkeypatch.setattr(requests, 'get', response)
+        utils.patch_requests_get(monkeypatch, response)
         try:
             homework_module.get_api_answer(current_timestamp)
         except Exception:
@@ -258,7 +259,7 @@ class TestHomework:
         def mock_request_get_with_exception(*args, **kwargs):
             raise requests.RequestException('Something wrong')
 
-        monkeypatch.setattr(requests, 'get', mock_request_get_with_exception)
+        utils.patch_requests_get(monkeypatch, mock_request_get_with_exception)
         try:
             homework_module.get_api_answer(current_timestamp)
         except requests.RequestException:
@@ -558,9 +559,11 @@ class TestHomework:
         )
 
         def sleep_to_interrupt(secs):
-            assert secs == self.RETRY_PERIOD, (
+            assert abs(secs - self.RETRY_PERIOD) <= (
+                self.RETRY_PERIOD * RETRY_JITTER
+            ), (
                 'Убедитесь, что повторный запрос к API домашки отправляется '
-                'через 10 минут: `time.sleep(RETRY_PERIOD)`.'
+                'через 10 минут с учетом разброса `RETRY_JITTER`.'
             )
             raise utils.BreakInfiniteLoop('break')
 
@@ -586,7 +589,7 @@ class TestHomework:
                 current_timestamp=current_timestamp, **kwargs
             )
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        utils.patch_requests_get(monkeypatch, mock_response_get)
 
     def test_main_without_env_vars_raise_exception(
             self, caplog, monkeypatch, random_timestamp, current_timestamp,
@@ -722,10 +725,8 @@ class TestHomework:
                 http_status=HTTPStatus.OK,
                 data=data_with_new_hw_status
             ))
-        monkeypatch.setattr(
-            requests,
-            'get',
-            mock_response_get_with_new_status
+        utils.patch_requests_get(
+            monkeypatch, mock_response_get_with_new_status
         )
 
         hw_status = data_with_new_hw_status['homeworks'][0]['status']
@@ -0,0 +1,108 @@
+import json
+
+import pytest
+
+import bot
+from breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from exceptions import CircuitOpenError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FixedRandom:
+    @staticmethod
+    def uniform(low, high):
+        return low
+
+
+def make_breaker(clock, threshold=3):
+    return CircuitBreaker(
+        'test', threshold=threshold, base=10, max_backoff=100,
+        clock=clock, rng=FixedRandom()
+    )
+
+
+def test_breaker_opens_after_threshold_failures():
+    breaker = make_breaker(FakeClock())
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError) as info:
+        breaker.before_call()
+    assert info.value.retry_after == pytest.approx(10)
+
+
+def test_half_open_lets_one_probe_through():
+    clock = FakeClock()
+    breaker = make_breaker(clock, threshold=1)
+    breaker.before_call()
+    breaker.record_failure()
+    clock.now = 10
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    breaker.before_call()
+
+
+def test_failed_probe_reopens_the_breaker():
+    clock = FakeClock()
+    breaker = make_breaker(clock, threshold=1)
+    breaker.before_call()
+    breaker.record_failure()
+    clock.now = 10
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.retry_in() == pytest.approx(10)
+    clock.now = 20
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+
+
+def test_retry_after_opens_the_breaker_at_once():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    breaker.before_call()
+    breaker.record_failure(retry_after=50)
+    assert breaker.state == OPEN
+    clock.now = 49
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    clock.now = 50
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+
+
+class BrokenJSONClient:
+    def get_json(self, *args, **kwargs):
+        raise json.JSONDecodeError('Expecting value', '<html>', 0)
+
+
+def test_invalid_json_on_probe_is_a_failure(monkeypatch):
+    clock = FakeClock()
+    breaker = make_breaker(clock, threshold=1)
+    breaker.before_call()
+    breaker.record_failure()
+    clock.now = 10
+    monkeypatch.setattr(bot, 'get_breaker', lambda name: breaker)
+    monkeypatch.setattr(bot, 'get_client', BrokenJSONClient)
+
+    with pytest.raises(json.JSONDecodeError):
+        bot.fetch_homeworks({}, 0)
+    assert breaker.state == OPEN
+    clock.now = 30
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
@@ -0,0 +1,36 @@
+import time
+
+import pytest
+
+import bot
+from deadline import Deadline, current_deadline
+from exceptions import DeadlineExceededError
+
+
+class RecordingClient:
+    def __init__(self):
+        self.deadlines = []
+
+    def get_json(self, url, headers, params, timeout=None, deadline=None):
+        self.deadlines.append(deadline)
+        return 200, {'homeworks': [], 'current_date': 1}, {}
+
+
+def test_run_exposes_its_deadline_to_the_call():
+    deadline = Deadline(budget=5)
+    assert deadline.run('stage', current_deadline) is deadline
+    assert current_deadline() is None
+
+
+def test_get_api_answer_uses_the_cycle_deadline(monkeypatch):
+    client = RecordingClient()
+    monkeypatch.setattr(bot, 'get_client', lambda: client)
+    deadline = Deadline(budget=5)
+    deadline.run('get_api_answer', bot.get_api_answer, 0)
+    assert client.deadlines == [deadline]
+
+
+def test_run_raises_when_the_budget_is_spent():
+    deadline = Deadline(budget=0.05)
+    with pytest.raises(DeadlineExceededError):
+        deadline.run('stage', time.sleep, 1)
@@ -0,0 +1,134 @@
+import threading
+
+import pytest
+import telegram
+
+from delivery import Delivery, DeliveryQueue, TokenBucket
+from exceptions import MessageError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeDeliver:
+    def __init__(self, errors=()):
+        self.errors = list(errors)
+        self.sent = []
+        self._lock = threading.Lock()
+
+    def __call__(self, bot, chat_id, text):
+        with self._lock:
+            self.sent.append((chat_id, text))
+            if self.errors:
+                error = self.errors.pop(0)
+                raise MessageError('Ошибка отправки') from error
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr('delivery.time.sleep', clock.sleep)
+    return clock
+
+
+def make_queue(deliver, clock, retries=3, chat_rate=100, workers=1):
+    return DeliveryQueue(
+        bot=None, deliver=deliver, workers=workers, retries=retries,
+        backoff=1, global_rate=100, chat_rate=chat_rate, clock=clock
+    )
+
+
+def test_token_bucket_waits_for_a_token():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, clock=clock)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.5)
+    clock.now = 0.5
+    assert bucket.reserve() == pytest.approx(0.5)
+    clock.now = 10
+    assert bucket.is_full()
+
+
+def test_send_waits_for_the_chat_bucket(clock):
+    deliver = FakeDeliver()
+    delivery_queue = make_queue(deliver, clock, chat_rate=1)
+    delivery_queue._send(Delivery(1, 'первое'))
+    delivery_queue._send(Delivery(1, 'второе'))
+    assert clock.sleeps == [pytest.approx(1)]
+    assert deliver.sent == [(1, 'первое'), (1, 'второе')]
+
+
+def test_send_retries_with_exponential_backoff(clock):
+    deliver = FakeDeliver([
+        telegram.error.NetworkError('сеть'),
+        telegram.error.TimedOut(),
+    ])
+    make_queue(deliver, clock)._send(Delivery(1, 'текст'))
+    assert len(deliver.sent) == 3
+    assert clock.sleeps == [1, 2]
+
+
+def test_send_honours_retry_after(clock):
+    deliver = FakeDeliver([telegram.error.RetryAfter(7)])
+    make_queue(deliver, clock)._send(Delivery(1, 'текст'))
+    assert len(deliver.sent) == 2
+    assert clock.sleeps == [7]
+
+
+@pytest.mark.parametrize('error', [
+    telegram.error.BadRequest('Chat not found'),
+    telegram.error.Unauthorized('Forbidden'),
+])
+def test_send_does_not_retry_permanent_errors(clock, error):
+    deliver = FakeDeliver([error])
+    with pytest.raises(MessageError):
+        make_queue(deliver, clock)._send(Delivery(1, 'текст'))
+    assert len(deliver.sent) == 1
+    assert clock.sleeps == []
+
+
+def test_future_fails_only_after_retries_run_out(clock):
+    delivery = Delivery(1, 'текст')
+    done = []
+
+    def deliver(bot, chat_id, text):
+        done.append(delivery.future.done())
+        raise MessageError('Ошибка отправки') from (
+            telegram.error.NetworkError('сеть')
+        )
+
+    delivery_queue = make_queue(deliver, clock, retries=2)
+    delivery_queue._queues[0].put(delivery)
+    delivery_queue._queues[0].put(None)
+    delivery_queue._work(delivery_queue._queues[0])
+
+    assert done == [False, False, False]
+    assert clock.sleeps == [1, 2]
+    assert isinstance(delivery.future.exception(), MessageError)
+
+
+def test_messages_of_one_chat_keep_their_order(clock):
+    deliver = FakeDeliver()
+    delivery_queue = make_queue(deliver, clock, workers=4)
+    delivery_queue.start()
+    futures = [
+        delivery_queue.submit(chat_id, f'{chat_id}-{number}')
+        for number in range(10) for chat_id in ('a', 'b', 'c')
+    ]
+    delivery_queue.stop(timeout=5)
+
+    assert all(future.result(timeout=0) is None for future in futures)
+    for chat_id in ('a', 'b', 'c'):
+        texts = [text for chat, text in deliver.sent if chat == chat_id]
+        assert texts == [f'{chat_id}-{number}' for number in range(10)]
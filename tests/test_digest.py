@@ -0,0 +1,104 @@
+from concurrent.futures import Future
+
+import pytest
+
+from digest import SEPARATOR, DigestQueue, split_digest
+from exceptions import MessageError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeDelivery:
+    def __init__(self):
+        self.sent = []
+
+    def submit(self, chat_id, text):
+        future = Future()
+        self.sent.append((chat_id, text, future))
+        return future
+
+
+def test_messages_go_to_different_texts_whole():
+    chunks = split_digest(['a' * 6, 'b' * 6, 'c' * 3], limit=10)
+    assert chunks == [
+        ('a' * 6, 1),
+        ('b' * 6, 1),
+        ('c' * 3, 1),
+    ]
+    assert split_digest(['ab', 'cd', 'e' * 8], limit=10) == [
+        (f'ab{SEPARATOR}cd', 2),
+        ('e' * 8, 1),
+    ]
+
+
+def test_message_longer_than_limit_is_cut_by_lines_and_words():
+    message = 'первая строка\nвторая строка с пробелами'
+    chunks = split_digest(['до', message, 'после'], limit=15)
+    assert all(len(text) <= 15 for text, _ in chunks)
+    assert chunks[0] == ('до', 1)
+    assert [text for text, _ in chunks[1:-1]] == [
+        'первая строка', 'вторая строка с', 'пробелами'
+    ]
+    assert [ended for _, ended in chunks[1:-1]] == [0, 0, 1]
+    assert chunks[-1] == ('после', 1)
+
+
+def test_digest_is_sent_after_the_window():
+    clock = FakeClock()
+    delivery = FakeDelivery()
+    digest = DigestQueue(delivery, window=60, max_items=10, clock=clock)
+    digest.submit(1, 'первое')
+    clock.now = 30
+    digest.submit(1, 'второе')
+    digest.flush(clock.now)
+    assert delivery.sent == []
+
+    clock.now = 60
+    digest.flush(clock.now)
+
+    assert [text for _, text, _ in delivery.sent] == [
+        f'первое{SEPARATOR}второе'
+    ]
+    assert digest.depth() == 0
+
+
+def test_digest_is_flushed_early_at_max_items():
+    clock = FakeClock()
+    delivery = FakeDelivery()
+    digest = DigestQueue(delivery, window=60, max_items=3, clock=clock)
+    futures = [digest.submit(1, str(number)) for number in range(4)]
+
+    assert [text for _, text, _ in delivery.sent] == [
+        SEPARATOR.join(['0', '1', '2'])
+    ]
+    assert digest.depth() == 1
+    delivery.sent[0][2].set_result(None)
+    assert [future.done() for future in futures] == [True] * 3 + [False]
+
+
+def test_delivery_error_reaches_every_future_of_its_text():
+    clock = FakeClock()
+    delivery = FakeDelivery()
+    digest = DigestQueue(
+        delivery, window=60, max_items=10, limit=10, clock=clock
+    )
+    futures = [
+        digest.submit(1, text) for text in ('ab', 'cd', 'e' * 8)
+    ]
+    digest.flush()
+    (_, first, failed), (_, second, sent) = delivery.sent
+    assert (first, second) == (f'ab{SEPARATOR}cd', 'e' * 8)
+
+    failed.set_exception(MessageError('Ошибка отправки'))
+    sent.set_result(None)
+
+    for future in futures[:2]:
+        with pytest.raises(MessageError):
+            future.result(timeout=0)
+    assert futures[2].result(timeout=0) is None
@@ -0,0 +1,69 @@
+import json
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from http_client import PracticumClient
+from metrics import REGISTRY
+
+BODY = json.dumps({'homeworks': [], 'current_date': 1}).encode()
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header('ETag', '"v1"')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('ETag', '"v1"')
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}/'
+    server.shutdown()
+    server.server_close()
+
+
+def test_client_reuses_the_connection_and_exports_counters(server):
+    client = PracticumClient(pool_size=1, timeout=5)
+    try:
+        for _ in range(3):
+            status, data, _ = client.get_json(
+                server, {'Authorization': 'OAuth token'}, {'from_date': 0}
+            )
+            assert status == HTTPStatus.OK
+            assert data == json.loads(BODY)
+    finally:
+        client.close()
+
+    assert client.requests_sent == 3
+    assert client.not_modified == 2
+    assert client.new_connections == 1
+    assert client.reused_connections() == 2
+    metrics = REGISTRY.render()
+    for kind, value in (
+        ('requests', 3), ('not_modified', 2), ('new', 1), ('reused', 2)
+    ):
+        assert (
+            f'homework_bot_http_connections{{kind="{kind}"}} {value}'
+            in metrics
+        )
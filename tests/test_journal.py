@@ -0,0 +1,77 @@
+from journal import Journal
+
+
+def test_journal_replays_cursors_and_statuses(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    journal = Journal(path)
+    journal.record_cursor('t1', 100)
+    journal.record_status('t1', '7', 'reviewing')
+    journal.record_status('t1', '7', 'approved')
+    journal.record_cursor('t1', 200)
+    journal.close()
+
+    restored = Journal(path)
+    assert restored.cursor('t1', 0) == 200
+    assert restored.delivered('t1', '7', 'approved')
+    assert not restored.delivered('t1', '7', 'reviewing')
+    assert restored.cursor('t2', 42) == 42
+    restored.close()
+
+
+def test_journal_truncates_torn_final_line(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    journal = Journal(str(path))
+    journal.record_cursor('t1', 100)
+    journal.record_status('t1', '7', 'approved')
+    journal.close()
+    good_size = path.stat().st_size
+    with open(path, 'a', encoding='UTF-8') as file:
+        file.write('["s", "t1", "8", "appr')
+
+    restored = Journal(str(path))
+    assert path.stat().st_size == good_size
+    assert restored.cursor('t1', 0) == 100
+    assert restored.delivered('t1', '7', 'approved')
+    assert not restored.delivered('t1', '8', 'approved')
+    restored.record_status('t1', '8', 'rejected')
+    restored.close()
+
+    assert Journal(str(path)).delivered('t1', '8', 'rejected')
+
+
+def test_journal_compaction_keeps_live_records(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    journal = Journal(str(path), compact_after=5)
+    for timestamp in range(20):
+        journal.record_cursor('t1', timestamp)
+    journal.record_status('t1', '7', 'approved', 'hw.zip')
+    journal.close()
+
+    assert len(path.read_text(encoding='UTF-8').splitlines()) < 20
+    restored = Journal(str(path))
+    assert restored.cursor('t1', None) == 19
+    assert restored.tenant_statuses('t1') == [('7', 'approved', 'hw.zip')]
+
+
+def test_journal_without_path_lives_in_memory():
+    journal = Journal()
+    journal.record_cursor('t1', 5)
+    journal.record_status('t1', '1', 'reviewing')
+    assert journal.cursor('t1', 0) == 5
+    assert journal.delivered('t1', '1', 'reviewing')
+    journal.close()
+
+
+def test_journal_keeps_names_and_reads_records_without_them(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    path.write_text('["s", "t1", "7", "approved"]\n', encoding='UTF-8')
+    journal = Journal(str(path))
+    journal.record_status('t1', '8', 'reviewing', 'вторая работа.zip')
+    journal.close()
+
+    restored = Journal(str(path))
+    assert sorted(restored.tenant_statuses('t1')) == [
+        ('7', 'approved', None),
+        ('8', 'reviewing', 'вторая работа.zip'),
+    ]
+    restored.close()
@@ -0,0 +1,44 @@
+from recording import TrafficRecorder, read_traffic
+
+
+def record(path):
+    recorder = TrafficRecorder(str(path), clock=lambda: 1.0)
+    recorder.response({'Authorization': 'OAuth x'}, 0, 200, {'homeworks': []})
+    recorder.message(1, 'текст')
+    recorder.close()
+
+
+def test_gzip_recording_round_trip(tmp_path):
+    path = tmp_path / 'traffic.jsonl.gz'
+    record(path)
+    entries = list(read_traffic(str(path)))
+    assert [entry['kind'] for entry in entries] == ['response', 'message']
+    assert entries[1]['text'] == 'текст'
+
+
+def test_unclosed_gzip_recording_is_readable(tmp_path):
+    path = tmp_path / 'traffic.jsonl.gz'
+    record(path)
+    recorder = TrafficRecorder(str(path), clock=lambda: 2.0)
+    recorder.message(1, 'после падения')
+    entries = list(read_traffic(str(path)))
+    assert [entry['at'] for entry in entries] == [1.0, 1.0, 2.0]
+    recorder.close()
+
+
+def test_truncated_gzip_keeps_complete_entries(tmp_path):
+    path = tmp_path / 'traffic.jsonl.gz'
+    record(path)
+    size = path.stat().st_size
+    record(path)
+    with open(path, 'r+b') as file:
+        file.truncate(size + (path.stat().st_size - size) // 2)
+    assert len(list(read_traffic(str(path)))) >= 2
+
+
+def test_torn_last_line_is_skipped(tmp_path):
+    path = tmp_path / 'traffic.jsonl'
+    record(path)
+    with open(path, 'a', encoding='UTF-8') as file:
+        file.write('{"kind": "mess')
+    assert len(list(read_traffic(str(path)))) == 2
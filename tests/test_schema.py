@@ -0,0 +1,68 @@
+import pytest
+
+from exceptions import (
+    InvalidTypeError,
+    InvalidValueError,
+    MissingKeyError,
+    ValidationError,
+)
+from schema import compile_schema, validate_homework, validate_response
+
+
+@pytest.mark.parametrize('response, error, path', [
+    ([], InvalidTypeError, 'response'),
+    ({'homeworks': []}, MissingKeyError, 'response'),
+    ({'current_date': 1}, MissingKeyError, 'response'),
+    ({'current_date': '1', 'homeworks': []}, InvalidTypeError,
+     'response.current_date'),
+    ({'current_date': 1, 'homeworks': {}}, InvalidTypeError,
+     'response.homeworks'),
+])
+def test_validate_response_errors(response, error, path):
+    with pytest.raises(error) as info:
+        validate_response(response)
+    assert info.value.path == path
+    assert str(info.value).startswith(f'{path}: ')
+
+
+def test_validate_response_accepts_valid_response():
+    validate_response({'current_date': 1, 'homeworks': []})
+
+
+@pytest.mark.parametrize('homework, error, path', [
+    ('hw', InvalidTypeError, 'homework'),
+    ({'status': 'approved'}, MissingKeyError, 'homework'),
+    ({'homework_name': 'hw'}, MissingKeyError, 'homework'),
+    ({'homework_name': 'hw', 'status': 'lost'}, InvalidValueError,
+     'homework.status'),
+])
+def test_validate_homework_errors(homework, error, path):
+    with pytest.raises(error) as info:
+        validate_homework(homework)
+    assert info.value.path == path
+
+
+def test_errors_keep_builtin_bases():
+    assert issubclass(MissingKeyError, KeyError)
+    assert issubclass(InvalidTypeError, TypeError)
+    assert issubclass(InvalidValueError, ValueError)
+    error = MissingKeyError('status is missing', 'homework')
+    assert str(error) == 'homework: status is missing'
+
+
+def test_list_item_errors_point_to_the_item():
+    validate = compile_schema({
+        'type': dict,
+        'keys': {'items': {'type': list, 'items': {
+            'type': dict, 'keys': {'name': {'type': str}},
+        }}},
+    }, 'root')
+    validate({'items': [{'name': 'a'}]})
+    with pytest.raises(InvalidTypeError) as info:
+        validate({'items': [{'name': 'a'}, {'name': 1}]})
+    assert info.value.path == 'root.items[1].name'
+    with pytest.raises(MissingKeyError) as info:
+        validate({'items': [{}]})
+    assert info.value.path == 'root.items[0]'
+    with pytest.raises(ValidationError):
+        validate({'items': ['a']})
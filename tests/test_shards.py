@@ -0,0 +1,40 @@
+import time
+
+from journal import Journal
+from shards import RELEASED, ShardSupervisor, load_saved_state
+from tenants import TenantRegistry
+
+
+def test_saved_state_is_collected_from_every_shard_journal(tmp_path):
+    base = str(tmp_path / 'journal.jsonl')
+    old = Journal(f'{base}.shard-0')
+    old.record_cursor('moved', 100)
+    old.record_status('moved', '1', 'reviewing', 'hw.zip')
+    old.record_cursor('stayed', 50)
+    old.close()
+    new = Journal(f'{base}.shard-3')
+    new.record_cursor('moved', 200)
+    new.record_status('moved', '1', 'approved', 'hw.zip')
+    new.close()
+    Journal(f'{base}.shard-1.tmp').close()
+
+    saved = load_saved_state(base)
+
+    assert saved == {
+        'moved': (200, [('1', 'approved', 'hw.zip')]),
+        'stayed': (50, []),
+    }
+
+
+def test_collect_ignores_late_results_of_other_tenants(tmp_path):
+    supervisor = ShardSupervisor(
+        TenantRegistry([]), workers=1,
+        journal_file=str(tmp_path / 'journal.jsonl'), handoff_timeout=1
+    )
+    supervisor._results.put((RELEASED, 'late', 10, []))
+    supervisor._results.put((RELEASED, 'wanted', 20, [('1', 'approved')]))
+    time.sleep(0.1)
+
+    handoffs = supervisor._collect({'wanted'})
+
+    assert handoffs == {'wanted': (20, [('1', 'approved')])}
@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+
+from bot import pending_updates, seed_state
+from commands import CommandPoller
+from config import COMMAND_REPLIES
+from journal import Journal
+from models import Homework
+from state import StateCache
+
+
+def record(homework_id, status='approved'):
+    return Homework(homework_id, f'{homework_id}.zip', status)
+
+
+def test_state_cache_evicts_least_recently_updated():
+    state = StateCache(maxsize=2)
+    state.apply('t1', record('1'))
+    state.apply('t2', record('2'))
+    state.apply('t1', record('1', 'rejected'))
+    state.apply('t1', record('3'))
+
+    assert len(state) == 2
+    assert {item.homework_id for item in state.latest('t1')} == {'1', '3'}
+    assert state.latest('t2') == []
+
+
+def test_evicted_homework_is_filtered_by_the_journal():
+    state, journal = StateCache(maxsize=1), Journal()
+    for homework_id in ('1', '2'):
+        state.apply('t1', record(homework_id))
+        journal.record_status('t1', homework_id, 'approved')
+
+    homeworks = [
+        {'id': homework_id, 'homework_name': 'hw.zip', 'status': 'approved'}
+        for homework_id in ('1', '2')
+    ]
+    assert pending_updates(homeworks, journal, 't1', state=state) == []
+
+
+def test_forget_drops_tenant_entries():
+    state = StateCache()
+    state.apply('t1', record('1'))
+    state.forget('t1')
+    assert len(state) == 0
+    assert state.history('t1') == []
+
+
+def test_status_after_restart_is_seeded_from_the_journal(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    journal = Journal(path)
+    journal.record_status('t1', '1', 'approved', 'hw1.zip')
+    journal.record_status('t1', '2', 'reviewing')
+    journal.close()
+
+    journal, state = Journal(path), StateCache()
+    seed_state(state, journal, 't1')
+    commands = CommandPoller(None, state, None, None, journal)
+    tenant = SimpleNamespace(tenant_id='t1', locale='ru')
+
+    assert [item.name for item in state.latest('t1')] == ['hw1.zip']
+    assert state.history('t1') == []
+    assert 'hw1.zip' in commands._status(tenant)
+    assert commands._history(tenant) == COMMAND_REPLIES['ru']['no_history']
+    journal.close()
+
+
+def test_status_is_unknown_when_the_journal_has_no_names():
+    journal, state = Journal(), StateCache()
+    journal.record_status('t1', '1', 'approved')
+    seed_state(state, journal, 't1')
+    commands = CommandPoller(None, state, None, None, journal)
+
+    replies = COMMAND_REPLIES['en']
+    seen = SimpleNamespace(tenant_id='t1', locale='en')
+    unseen = SimpleNamespace(tenant_id='t2', locale='en')
+
+    assert commands._status(seen) == replies['unknown']
+    assert commands._status(unseen) == replies['empty']
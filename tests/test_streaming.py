@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from streaming import HomeworkStream
+
+RESPONSE = {
+    'homeworks': [
+        {'id': 1, 'homework_name': 'первая работа.zip',
+         'status': 'approved', 'date_updated': '2024-01-01T00:00:00Z'},
+        {'id': 22, 'homework_name': 'hw "2".zip', 'status': 'rejected',
+         'reviewer_comment': 'ok, но есть [замечания] и {скобки}'},
+    ],
+    'current_date': 1700000000,
+}
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 64, 10 ** 6])
+def test_stream_matches_json_loads_for_any_chunk_size(size):
+    body = json.dumps(RESPONSE, ensure_ascii=False, indent=1).encode()
+    stream = HomeworkStream(chunked(body, size))
+    assert list(stream) == RESPONSE['homeworks']
+    assert stream.current_date == RESPONSE['current_date']
+    assert stream.count == len(RESPONSE['homeworks'])
+
+
+def test_stream_splits_multibyte_characters_and_numbers():
+    body = json.dumps(RESPONSE, ensure_ascii=False).encode()
+    cut = body.index('первая'.encode()) + 1
+    number = body.index(b'1700000000') + 5
+    chunks = [body[:cut], body[cut:number], body[number:]]
+    stream = HomeworkStream(chunks)
+    assert list(stream) == RESPONSE['homeworks']
+    assert stream.current_date == 1700000000
+
+
+def test_stream_accepts_empty_homeworks_and_extra_keys():
+    body = b'{"extra": {"a": [1, 2]}, "homeworks": [], "current_date": 5}'
+    stream = HomeworkStream(chunked(body, 4))
+    assert list(stream) == []
+    assert stream.current_date == 5
+
+
+@pytest.mark.parametrize('body, error', [
+    (b'[]', TypeError),
+    (b'{"homeworks": {}, "current_date": 1}', TypeError),
+    (b'{"homeworks": [], "current_date": "1"}', TypeError),
+    (b'{"homeworks": []}', KeyError),
+    (b'{"current_date": 1}', KeyError),
+    (b'{"homeworks": [], "current_date": 1} []', json.JSONDecodeError),
+    (b'{"homeworks": [{"id": 1}', json.JSONDecodeError),
+])
+def test_stream_reports_malformed_responses(body, error):
+    with pytest.raises(error):
+        list(HomeworkStream(chunked(body, 3)))
@@ -0,0 +1,128 @@
+import asyncio
+import json
+import os
+
+from engine import PollingEngine
+from journal import Journal
+from tenants import Tenant, TenantRegistry, TenantSource
+
+
+def tenant(tenant_id, token='token'):
+    return {
+        'tenant_id': tenant_id, 'practicum_token': token, 'chat_id': tenant_id
+    }
+
+
+def write(path, content):
+    if not isinstance(content, str):
+        content = json.dumps(content)
+    mtime = os.stat(path).st_mtime_ns + 10 ** 9 if path.exists() else None
+    path.write_text(content, encoding='UTF-8')
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+
+
+def ids(tenants):
+    return sorted(
+        item if isinstance(item, str) else item.tenant_id for item in tenants
+    )
+
+
+def test_file_edit_reports_only_changed_tenants(tmp_path):
+    path = tmp_path / 'tenants.json'
+    write(path, [tenant('a'), tenant('b'), tenant('c')])
+    source = TenantSource(str(path))
+    added, updated, removed = source.poll()
+    assert (ids(added), updated, removed) == (['a', 'b', 'c'], [], [])
+
+    write(path, [tenant('a'), tenant('b', 'new'), tenant('d')])
+    added, updated, removed = source.poll()
+
+    assert ids(added) == ['d']
+    assert ids(updated) == ['b']
+    assert removed == ['c']
+    assert source.tenants['b'].practicum_token == 'new'
+    assert source.poll() == ([], [], [])
+
+
+def test_deleted_file_removes_its_tenants(tmp_path):
+    write(tmp_path / 'first.json', [tenant('a')])
+    write(tmp_path / 'second.json', [tenant('b')])
+    source = TenantSource(str(tmp_path))
+    source.poll()
+
+    (tmp_path / 'second.json').unlink()
+
+    assert source.poll() == ([], [], ['b'])
+    assert ids(source.tenants) == ['a']
+
+
+def test_unparseable_file_keeps_its_tenants(tmp_path):
+    path = tmp_path / 'tenants.json'
+    write(path, [tenant('a')])
+    source = TenantSource(str(path))
+    source.poll()
+
+    write(path, '[{"tenant_id": ')
+
+    assert source.poll() == ([], [], [])
+    assert ids(source.tenants) == ['a']
+    write(path, [tenant('a', 'new')])
+    assert ids(source.poll()[1]) == ['a']
+
+
+def test_tenant_moved_between_files_keeps_running(tmp_path):
+    write(tmp_path / 'first.json', [tenant('a'), tenant('b')])
+    write(tmp_path / 'second.json', [])
+    source = TenantSource(str(tmp_path))
+    source.poll()
+
+    write(tmp_path / 'second.json', [tenant('b', 'moved')])
+    added, updated, removed = source.poll()
+    assert (added, ids(updated), removed) == ([], ['b'], [])
+
+    write(tmp_path / 'first.json', [tenant('a')])
+    assert source.poll() == ([], [], [])
+    assert source.tenants['b'].practicum_token == 'moved'
+
+
+def test_tenant_moved_in_one_poll_keeps_running(tmp_path):
+    write(tmp_path / 'first.json', [tenant('a'), tenant('b')])
+    write(tmp_path / 'second.json', [])
+    source = TenantSource(str(tmp_path))
+    source.poll()
+
+    write(tmp_path / 'first.json', [tenant('a')])
+    write(tmp_path / 'second.json', [tenant('b')])
+
+    assert source.poll() == ([], [], [])
+    assert ids(source.tenants) == ['a', 'b']
+
+
+def test_apply_changes_restarts_only_changed_tenants():
+    async def scenario():
+        engine = PollingEngine(
+            TenantRegistry(), bot=None, journal=Journal(), commands=False
+        )
+        engine.apply_changes(
+            [Tenant('a', 'token', 'a'), Tenant('b', 'token', 'b'),
+             Tenant('c', 'token', 'c')], [], []
+        )
+        tasks = dict(engine._tasks)
+
+        engine.apply_changes(
+            [Tenant('d', 'token', 'd')], [Tenant('b', 'new', 'b')], ['c']
+        )
+        await asyncio.sleep(0)
+
+        assert engine._tasks['a'] is tasks['a']
+        assert not tasks['a'].cancelled()
+        assert engine._tasks['b'] is not tasks['b']
+        assert tasks['b'].cancelled() and tasks['c'].cancelled()
+        assert sorted(engine._tasks) == ['a', 'b', 'd']
+        assert engine.registry.get('b').practicum_token == 'new'
+        assert 'c' not in engine.registry
+        for task in engine._tasks.values():
+            task.cancel()
+
+    asyncio.run(scenario())
@@ -0,0 +1,81 @@
+from concurrent.futures import Future
+
+from bot import advance_cursor, enqueue_updates, pending_updates
+from delivery import PendingDeliveries
+from journal import Journal
+from state import StateCache
+
+TENANT = 't1'
+
+
+class FakeQueue:
+    def __init__(self):
+        self.sent = []
+
+    def submit(self, chat_id, text):
+        future = Future()
+        self.sent.append((text, future))
+        return future
+
+
+def make_homework(status, date_updated='2024-01-01T00:00:00Z'):
+    return {
+        'id': 7, 'homework_name': 'hw.zip', 'status': status,
+        'date_updated': date_updated,
+    }
+
+
+def poll(queue, journal, pending, state, homeworks, current_date):
+    updates = pending_updates(homeworks, journal, TENANT, state=state)
+    futures = enqueue_updates(
+        queue, 1, updates, journal, pending, TENANT, state
+    )
+    advance_cursor(journal, TENANT, current_date, futures)
+
+
+def test_cursor_and_state_wait_for_delivery():
+    queue, journal, pending, state = (
+        FakeQueue(), Journal(), PendingDeliveries(), StateCache()
+    )
+    poll(queue, journal, pending, state, [make_homework('approved')], 100)
+
+    assert journal.cursor(TENANT, None) is None
+    assert state.latest(TENANT) == []
+    poll(queue, journal, pending, state, [make_homework('approved')], 200)
+    assert len(queue.sent) == 1
+
+    queue.sent[0][1].set_result(None)
+    assert journal.cursor(TENANT, None) == 200
+    assert journal.delivered(TENANT, '7', 'approved')
+    assert [record.status for record in state.latest(TENANT)] == ['approved']
+
+
+def test_failed_delivery_keeps_cursor_and_is_retried():
+    queue, journal, pending, state = (
+        FakeQueue(), Journal(), PendingDeliveries(), StateCache()
+    )
+    journal.record_cursor(TENANT, 50)
+    poll(queue, journal, pending, state, [make_homework('approved')], 100)
+    queue.sent[0][1].set_exception(RuntimeError('telegram is down'))
+
+    assert journal.cursor(TENANT, None) == 50
+    assert state.latest(TENANT) == []
+    poll(queue, journal, pending, state, [make_homework('approved')], 100)
+    assert len(queue.sent) == 2
+
+
+def test_repeated_transitions_are_all_delivered():
+    queue, journal, pending, state = (
+        FakeQueue(), Journal(), PendingDeliveries(), StateCache()
+    )
+    statuses = ['reviewing', 'rejected', 'reviewing', 'rejected']
+    for day, status in enumerate(statuses, start=1):
+        homework = make_homework(status, f'2024-01-0{day}T00:00:00Z')
+        poll(queue, journal, pending, state, [homework], day)
+        poll(queue, journal, pending, state, [homework], day)
+        for _, future in queue.sent:
+            if not future.done():
+                future.set_result(None)
+
+    assert len(queue.sent) == len(statuses)
+    assert journal.cursor(TENANT, None) == len(statuses)
@@ -1,3 +1,4 @@
+import json
 import logging
 from collections import namedtuple
 from contextlib import contextmanager
@@ -5,6 +6,8 @@ from http import HTTPStatus
 from inspect import signature
 from types import ModuleType
 
+import requests
+
 
 def check_function(scope: ModuleType, func_name: str, params_qty: int = 0):
     """If scope has a function with specific name and params with qty."""
@@ -81,8 +84,21 @@ class MockResponseGET:
         self.status_code = http_status
         self.reason = ''
         self.text = ''
+        self.headers = {}
         logging.warn(MockResponseGET.CALLED_LOG_MSG)
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        pass
+
+    def iter_content(self, chunk_size=1):
+        yield json.dumps(self.json()).encode()
+
     def json(self):
         data = {
             "homeworks": [],
@@ -103,3 +119,12 @@ class MockTelegramBot:
 
 class BreakInfiniteLoop(Exception):
     pass
+
+
+def patch_requests_get(monkeypatch, mock_get):
+    """Replace GET requests both via requests.get and requests.Session."""
+    def session_get(session, *args, **kwargs):
+        return mock_get(*args, **kwargs)
+
+    monkeypatch.setattr(requests, 'get', mock_get)
+    monkeypatch.setattr(requests.Session, 'get', session_get)